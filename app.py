@@ -1,12 +1,35 @@
+import time
+IMPORT_START = time.perf_counter()
 import urwid
 import urwid.escape as esc
-import time
-import pyfiglet
+import gc
+import os
+import sys
+import mmap
+import stat
+import array
+import errno
+import hashlib
+import heapq
+import itertools
+import collections
+import argparse
+import contextlib
+import threading
+import subprocess
+# pyfiglet is imported only when a splash isn't in the cache (splash_art)
+IMPORT_END = time.perf_counter()
 
 # Preserve original escape codes for showing and hiding the cursor
 SHOW_CURSOR_ORIGINAL = esc.SHOW_CURSOR
 HIDE_CURSOR_ORIGINAL = esc.HIDE_CURSOR
 
+# Fuzzy search keeps only this many best matches; menus this long or
+# longer are scored with NumPy when it is installed
+FUZZY_TOP_K = 1000
+FUZZY_VECTORIZE_MIN = 20000
+FILTER_SHARD_SIZE = 1 << 16
+
 class LeftLabelLineBox(urwid.WidgetWrap):
     """
     A custom widget similar to urwid.LineBox(). It draws a box around the given
@@ -86,50 +109,1168 @@ class LeftLabelLineBox(urwid.WidgetWrap):
         ])
 
 
-class MenuButton(urwid.Button):
+# xterm's basic 16 colours, in urwid's colour order, for 16-colour output
+BASIC_COLORS = (
+    ("black", (0, 0, 0)), ("dark red", (205, 0, 0)),
+    ("dark green", (0, 205, 0)), ("brown", (205, 205, 0)),
+    ("dark blue", (0, 0, 238)), ("dark magenta", (205, 0, 205)),
+    ("dark cyan", (0, 205, 205)), ("light gray", (229, 229, 229)),
+    ("dark gray", (127, 127, 127)), ("light red", (255, 0, 0)),
+    ("light green", (0, 255, 0)), ("yellow", (255, 255, 0)),
+    ("light blue", (92, 92, 255)), ("light magenta", (255, 0, 255)),
+    ("light cyan", (0, 255, 255)), ("white", (255, 255, 255)),
+)
+UNKNOWN = object()
+
+
+def nearest_basic_color(rgb):
+    if rgb[0] is None:
+        return "default"
+    return min(BASIC_COLORS, key=lambda entry: sum((a - b) ** 2 for a, b in zip(entry[1], rgb)))[0]
+
+
+class LowBandwidthScreen(urwid.display.raw.Screen):
     """
-    Custom button class for menu items, left-aligned with an arrow when focused,
-    and hides the cursor in the menu area.
+    Raw terminal screen that counts the bytes written for each frame and,
+    when `low_bandwidth` is set, only repaints the cells that changed.
+
+    urwid skips rows that match the previous frame but rewrites a changed
+    row in full. Here a changed row is compared cell by cell with what is
+    on the terminal and only the differing spans are sent, each behind the
+    shortest cursor move that reaches it, with attribute sequences written
+    only when the attribute actually changes. At 16 colours, 256-colour
+    and true-colour attributes (thumbnails) use the nearest basic colour.
+    """
+    SPAN_GAP = 6  # unchanged cells cheaper to rewrite than to jump over
+
+    def __init__(self, low_bandwidth=False, **kwargs):
+        super().__init__(**kwargs)
+        self.low_bandwidth = low_bandwidth
+        self.frames = 0
+        self.frame_bytes = 0
+        self.bytes_written = 0
+        self._basic_attrs = {}
+        self._forget()
+
+    def _forget(self):
+        """Stop trusting what we last drew; the next frame repaints everything."""
+        self._canvas = None
+        self._rows = []
+        self._cells = []
+        self._cursor = None
+        self._attr = UNKNOWN
+
+    def _start(self, *args, **kwargs):
+        super()._start(*args, **kwargs)
+        self._forget()
+
+    def _stop(self):
+        if self.low_bandwidth:
+            self.write("\x1b[?7h")  # autowrap back on
+        super()._stop()
+
+    def clear(self):
+        super().clear()
+        self._forget()
+
+    def write(self, data):
+        self.bytes_written += len(data.encode("utf-8", "replace"))
+        super().write(data)
+
+    def stats(self):
+        average = self.bytes_written // self.frames if self.frames else 0
+        mode = "low-bandwidth" if self.low_bandwidth else "full-row"
+        return (f"{mode} output: last frame {self.frame_bytes} B  "
+                f"avg {average} B over {self.frames} frames")
+
+    def draw_screen(self, size, canvas):
+        before = self.bytes_written
+        if self.low_bandwidth and self._rows_used is None and urwid.util.get_encoding() == "utf-8":
+            self._draw_changes(size, canvas)
+        else:
+            super().draw_screen(size, canvas)
+            self._forget()
+        if self.bytes_written != before:
+            self.frames += 1
+            self.frame_bytes = self.bytes_written - before
+
+    def _attrspec_to_escape(self, a):
+        if self.colors <= 16 and (a.foreground_high or a.foreground_true
+                                  or a.background_high or a.background_true):
+            basic = self._basic_attrs.get(a)
+            if basic is None:
+                rgb = a.get_rgb_values()
+                settings = [name for name in ("bold", "italics", "underline", "blink", "standout", "strikethrough")
+                            if getattr(a, name, False)]
+                foreground = ",".join([nearest_basic_color(rgb[:3])] + settings)
+                basic = self._basic_attrs[a] = urwid.AttrSpec(foreground, nearest_basic_color(rgb[3:]), 16)
+            a = basic
+        return super()._attrspec_to_escape(a)
+
+    def _draw_changes(self, size, canvas):
+        if not self._started:
+            raise RuntimeError
+        if self._resized or canvas is self._canvas:
+            return
+        maxcol, maxrow = size
+        if maxrow != canvas.rows():
+            raise ValueError(maxrow)
+
+        output = []
+        if len(self._rows) != maxrow or (self._cells and len(self._cells[0]) != maxcol):
+            self._forget()
+            # Nothing below may wrap or scroll, even writing the last column
+            output.append("\x1b[?7l")
+        rows = list(canvas.content())
+        cells = self._cells or [None] * maxrow
+        for y, row in enumerate(rows):
+            if self._rows and self._rows[y] == row:
+                continue
+            old, new = cells[y], self._row_cells(row)
+            for start, end in self._changed_spans(old, new):
+                self._move_to(output, start, y)
+                blank = self._blank_tail(new, start) if end == maxcol else 0
+                for attr, text in new[start:end - blank]:
+                    if attr != self._attr:
+                        output.append(self._attr_to_escape(attr))
+                        self._attr = attr
+                    output.append(text)
+                end -= blank
+                if blank:
+                    if new[-1][0] != self._attr:
+                        output.append(self._attr_to_escape(new[-1][0]))
+                        self._attr = new[-1][0]
+                    output.append("\x1b[K")  # erase to the end of the row
+                # The cursor stays put after writing the last column
+                self._cursor = (end, y) if end < maxcol else None
+            cells[y] = new
+        if canvas.cursor is not None:
+            self._move_to(output, *canvas.cursor)
+
+        if output:
+            try:
+                self.write("".join(output))
+                self.flush()
+            except OSError as e:
+                # ignore interrupted syscall
+                if e.args[0] != errno.EINTR:
+                    raise
+        self._canvas = canvas
+        self._rows = rows
+        self._cells = cells
+
+    @staticmethod
+    def _row_cells(row):
+        """One (attr, text) per screen column; wide characters are followed by (attr, "")."""
+        cells = []
+        for attr, _charset, run in row:
+            for char in run.decode("utf-8", "replace"):
+                width = urwid.str_util.get_char_width(char)
+                if width == 0 and cells:
+                    cells[-1] = (cells[-1][0], cells[-1][1] + char)
+                    continue
+                if char < " " or "\x7f" <= char < "\xa0":
+                    char = "?"
+                cells.append((attr, char))
+                if width == 2:
+                    cells.append((attr, ""))
+        return cells
+
+    def _blank_tail(self, cells, start):
+        """How many trailing blanks can be erased instead of written."""
+        attr = cells[-1][0]
+        spec = self._pal_attrspec.get(attr, attr)
+        if not self.back_color_erase or (isinstance(spec, urwid.AttrSpec) and (spec.standout or spec.underline)):
+            return 0
+        blank = 0
+        while blank < len(cells) - start and cells[-1 - blank] == (attr, " "):
+            blank += 1
+        return blank if blank > 3 else 0
+
+    def _changed_spans(self, old, new):
+        if old is None or len(old) != len(new):
+            yield 0, len(new)
+            return
+        start = end = None
+        for x, (before, after) in enumerate(zip(old, new)):
+            if before == after:
+                continue
+            if start is None:
+                start = x
+            elif x - end > self.SPAN_GAP:
+                yield self._whole_chars(new, start, end)
+                start = x
+            end = x + 1
+        if start is not None:
+            yield self._whole_chars(new, start, end)
+
+    @staticmethod
+    def _whole_chars(cells, start, end):
+        # Never start or stop a span in the middle of a wide character
+        if start and cells[start][1] == "":
+            start -= 1
+        if end < len(cells) and cells[end][1] == "":
+            end += 1
+        return start, end
+
+    def _move_to(self, output, x, y):
+        if self._cursor == (x, y):
+            return
+        move = f"\x1b[{y + 1};{x + 1}H" if x else f"\x1b[{y + 1}H"
+        if self._cursor is not None and self._cursor[1] == y and self._cursor[0] < x:
+            forward = f"\x1b[{x - self._cursor[0]}C"
+            if len(forward) < len(move):
+                move = forward
+        output.append(move)
+        self._cursor = (x, y)
+
+
+class ScheduledMainLoop(urwid.MainLoop):
     """
+    MainLoop that batches work per burst of input and caps the frame rate.
+
+    urwid hands every key that is already waiting to the widgets before it
+    goes idle and redraws. defer() queues a callback to run once, just
+    before the next frame, so handlers that fire per key (a paste into the
+    search box) only leave work behind and it runs once for the whole
+    burst. Consecutive mouse drags in one batch collapse to the last
+    position, and frames are drawn at most `fps` times a second.
+    """
+    def __init__(self, *args, fps=60, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.frame_interval = 1 / fps
+        self._deferred = {}
+        self._last_frame = 0
+        self._frame_alarm = None
+
+    def defer(self, callback, *args):
+        """Run callback(*args) once before the next frame; a repeat call replaces the arguments."""
+        self._deferred[callback] = args
+
+    def input_filter(self, keys, raw):
+        keys = super().input_filter(keys, raw)
+        batched = []
+        for key in keys:
+            if (batched and urwid.util.is_mouse_event(key) and key[0] == "mouse drag"
+                    and urwid.util.is_mouse_event(batched[-1]) and batched[-1][:2] == key[:2]):
+                batched[-1] = key
+            else:
+                batched.append(key)
+        return batched
+
+    def process_input(self, keys):
+        # A burst of printable keys for the focused Edit (a paste) goes in
+        # as one insert: typing it key by key re-measures the whole widget
+        # tree per character, which is quadratic in the pasted length.
+        handled = False
+        typed = []
+        for key in list(keys) + [None]:
+            if isinstance(key, str) and len(key) == 1 and key.isprintable():
+                typed.append(key)
+                continue
+            if typed:
+                handled = self._type(typed) or handled
+                typed = []
+            if key is not None:
+                handled = super().process_input([key]) or handled
+        return handled
+
+    def _type(self, chars):
+        edit = self._focused_edit()
+        if len(chars) > 1 and edit is not None and all(edit.valid_char(char) for char in chars):
+            edit.insert_text("".join(chars))
+            return True
+        return super().process_input(chars)
+
+    def _focused_edit(self):
+        widget = self._topmost_widget
+        while widget is not None:
+            base = widget.base_widget
+            if isinstance(base, urwid.Edit):
+                return base
+            widget = getattr(base, "focus", None)
+            if widget is None:
+                widget = getattr(base, "_wrapped_widget", None)
+        return None
+
+    def entering_idle(self):
+        if self._frame_alarm is not None or not self.screen.started:
+            return
+        wait = self._last_frame + self.frame_interval - time.monotonic()
+        if wait > 0:
+            # Too soon for another frame; going idle after the alarm draws it
+            self._frame_alarm = self.set_alarm_in(wait, self._frame_due)
+            return
+        while self._deferred:
+            deferred, self._deferred = self._deferred, {}
+            for callback, args in deferred.items():
+                callback(*args)
+        self._last_frame = time.monotonic()
+        self.draw_screen()
+
+    def _frame_due(self, loop, user_data):
+        self._frame_alarm = None
+
+
+class CursorController:
+    """
+    Owns the terminal cursor's visibility for a raw-display screen.
+
+    urwid hides the cursor at the start of every frame and shows it again
+    whenever the canvas has a cursor. Instead of widgets patching
+    urwid.escape from render(), the screen's frames are filtered here: the
+    cursor is visible exactly when the focused widget placed one (the
+    search box), and show/hide sequences are only written when that
+    changes, so renders stay side-effect free and cacheable.
+    """
+    def __init__(self):
+        self.visible = None  # unknown until the first frame
+        self._drawing = False
+        self._wants_cursor = False
+
+    def attach(self, screen):
+        draw_screen = screen.draw_screen
+        write = screen.write
+
+        def controlled_draw_screen(size, canvas):
+            self._wants_cursor = canvas.cursor is not None
+            self._drawing = True
+            try:
+                draw_screen(size, canvas)
+            finally:
+                self._drawing = False
+
+        def controlled_write(data):
+            write(self.filter(data) if self._drawing else self.track(data))
+
+        screen.draw_screen = controlled_draw_screen
+        screen.write = controlled_write
+        return self
+
+    def filter(self, frame):
+        frame = frame.replace(HIDE_CURSOR_ORIGINAL, '').replace(SHOW_CURSOR_ORIGINAL, '')
+        if self._wants_cursor != self.visible:
+            self.visible = self._wants_cursor
+            # Showing goes last, after urwid has moved the cursor into place
+            frame = frame + SHOW_CURSOR_ORIGINAL if self.visible else HIDE_CURSOR_ORIGINAL + frame
+        return frame
+
+    def track(self, data):
+        # Writes outside a frame (start/stop, suspend) may change the cursor
+        if SHOW_CURSOR_ORIGINAL in data or HIDE_CURSOR_ORIGINAL in data:
+            self.visible = data.rfind(SHOW_CURSOR_ORIGINAL) > data.rfind(HIDE_CURSOR_ORIGINAL)
+        return data
+
+
+class MenuButton(urwid.Widget):
+    """
+    One-line menu row, left-aligned with an arrow when focused. The caption
+    may be a plain string or an (attr, string) tuple.
+
+    The focused and unfocused canvases are built once per width and reused
+    until bind() gives the row a new caption, so moving the focus only
+    swaps cached canvases instead of re-laying out the label.
+    """
+    __slots__ = ('_attr', '_caption', '_canvases', 'item')
+
+    _selectable = True
+    _sizing = frozenset([urwid.FLOW])
+    signals = ['click']
+
+    _prefix_unfocused = "   "
+    _prefix_focused = "-> "
+
     def __init__(self, caption, on_press=None, user_data=None):
-        super().__init__("", on_press=on_press, user_data=user_data)
-        self._caption = caption
-        self._prefix_unfocused = "   "
-        self._prefix_focused = "-> "
-        # Create a label widget with cursor initially hidden
-        label_text = self._prefix_unfocused + caption
-        self._label = urwid.SelectableIcon(label_text, cursor_position=-1)
-        # Wrap it in an AttrMap for possible interactive styling
-        self._w = urwid.AttrMap(
-            urwid.Padding(self._label, align='left', width=('relative', 100)),
-            None, None
-        )
+        super().__init__()
+        self._canvases = {}
+        self.bind(caption)
+        if on_press:
+            urwid.connect_signal(self, 'click', on_press, user_data)
 
     def get_caption(self):
         return self._caption
 
+    def bind(self, caption, item=None):
+        """
+        Point the button at a new caption and the item it stands for,
+        so a VirtualListWalker can recycle it for another row
+        """
+        if isinstance(caption, tuple) and len(caption) == 2:
+            self._attr, self._caption = caption
+        else:
+            self._attr, self._caption = None, caption
+        self.item = item
+        self._canvases.clear()
+        self._invalidate()
+
+    def rows(self, size, focus=False):
+        return 1
+
     def render(self, size, focus=False):
         """
-        Update the displayed text based on focus state while keeping cursor hidden
+        Draw the arrow when focused; no cursor is placed in the menu area
         """
-        prefix = self._prefix_focused if focus else self._prefix_unfocused
-        self._label.set_text(prefix + self._caption)
-        self._label.cursor_position = -1
-        return super().render(size, focus)
+        canvas = self._canvases.get((size, focus))
+        if canvas is None:
+            prefix = self._prefix_focused if focus else self._prefix_unfocused
+            # Long captions are clipped so every row stays one line tall (VirtualListBox)
+            label = urwid.Text([(self._attr, prefix), (self._attr, self._caption)], wrap='ellipsis')
+            canvas = label.render(size)
+            self._canvases[(size, focus)] = canvas
+        return canvas
+
+    def keypress(self, size, key):
+        if self._command_map[key] != urwid.ACTIVATE:
+            return key
+        self._emit('click')
+        return None
 
+    def mouse_event(self, size, event, button, col, row, focus):
+        if button != 1 or not urwid.util.is_mouse_press(event):
+            return False
+        self._emit('click')
+        return True
 
-class NonTabSearchPile(urwid.Pile):
+
+class VirtualListWalker(urwid.ListWalker):
     """
-    A custom Pile that forbids normal arrow or tab navigation into the search box
-    and toggles the cursor display depending on focus.
+    List walker over a plain sequence of items that only keeps row widgets
+    for positions within `margin` of the focus. Rows that drift out of that
+    window go back to a pool and are rebound to other items as the view
+    scrolls, so a list of any length costs a bounded number of widgets.
+    make_row() builds an empty row and bind_row(row, item) fills it in.
+    Every row is `row_height` lines tall; see VirtualListBox.
     """
-    def render(self, size, focus=False):
-        # Reset SHOW_CURSOR to the correct ANSI escape sequence, not a Boolean
-        if self.focus_position == 0:
-            esc.SHOW_CURSOR = SHOW_CURSOR_ORIGINAL
+    def __init__(self, items, make_row, bind_row, row_height=1, margin=200):
+        self.items = items
+        self.focus = 0
+        self.row_height = row_height
+        self._make_row = make_row
+        self._bind_row = bind_row
+        self._margin = margin
+        self._rows = {}
+        self._pool = []
+
+    def set_items(self, items, focus=0):
+        """Show a new sequence of items; every row is recycled."""
+        self.items = items
+        self._pool.extend(self._rows.values())
+        self._rows.clear()
+        self.focus = focus
+        self._modified()
+
+    def _trim(self):
+        low = self.focus - self._margin
+        high = self.focus + self._margin
+        for position in [position for position in self._rows if not low <= position <= high]:
+            self._pool.append(self._rows.pop(position))
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, position):
+        row = self._rows.get(position)
+        if row is None:
+            if position < 0:
+                raise IndexError(position)
+            item = self.items[position]
+            if len(self._rows) > 3 * self._margin:
+                self._trim()
+            row = self._pool.pop() if self._pool else self._make_row()
+            self._bind_row(row, item)
+            self._rows[position] = row
+        return row
+
+    def set_focus(self, position):
+        self.focus = position
+        self._modified()
+
+    def next_position(self, position):
+        if position + 1 >= len(self.items):
+            raise IndexError(position)
+        return position + 1
+
+    def prev_position(self, position):
+        if position <= 0:
+            raise IndexError(position)
+        return position - 1
+
+    def positions(self, reverse=False):
+        if reverse:
+            return range(len(self.items) - 1, -1, -1)
+        return range(len(self.items))
+
+
+class IncrementalFilter:
+    """
+    Substring filter over a fixed list of strings, with the lowercased
+    keys built once. A query containing the previous one can only match
+    a subset of what that matched, so only those matches are rescanned,
+    and the results for the shorter queries typed on the way are kept so
+    backspacing is free. Matches are returned as indices into `items`.
+    """
+    def __init__(self, items):
+        self.items = items
+        if isinstance(items, MappedItems):
+            self.keys = items.lowered()
+        else:
+            self.keys = list(map(str.lower, items))
+        self._results = [("", range(len(items)))]
+
+    def matches(self, query):
+        """Indices of the items whose key contains the lowercase `query`."""
+        results = self._results
+        while results[-1][0] not in query:
+            results.pop()
+        previous, indices = results[-1]
+        if previous == query:
+            return indices
+        found = self._scan(query, None if isinstance(indices, range) else indices)
+        results.append((query, found))
+        return found
+
+    def extend(self, items):
+        """Add items; the results kept for typed queries grow to cover them."""
+        start = len(self.keys)
+        self.items.extend(items)
+        self.keys.extend(map(str.lower, items))
+        self._added(start)
+        results = self._results
+        results[0] = ("", range(len(self.keys)))
+        added = range(start, len(self.keys))
+        for k, (query, found) in enumerate(results[1:], 1):
+            added = self._scan(query, added)
+            results[k] = (query, self._join(found, added))
+
+    def _added(self, start):
+        """Hook: the keys from `start` on are new."""
+
+    @staticmethod
+    def _join(found, added):
+        return found + added
+
+    def _scan(self, query, indices):
+        """Matches for `query` among `indices`, or among all items for None."""
+        keys = self.keys
+        if indices is None:
+            return [i for i, key in enumerate(keys) if query in key]
+        return [i for i in indices if query in keys[i]]
+
+
+class FuzzyMatcher(IncrementalFilter):
+    """
+    fzf-style fuzzy matching: an item matches when the query's characters
+    appear in its key in order. Matches are ranked by score (matched
+    characters, more for word starts and runs, less for gaps), then
+    shorter keys, then catalog order; rank() keeps only the best `top_k`.
+
+    Every key has a bitmask of the characters in it, so items missing
+    one of the query's characters are dropped with one AND before any
+    scanning. For catalogs of FUZZY_VECTORIZE_MIN items or more, and when
+    NumPy is installed, the keys are also packed into one byte buffer
+    and alignment and scoring run as array operations over all surviving
+    candidates at once, one query character at a time. The first time a
+    character is typed, its offsets in the buffer and where each key's
+    first one is are found and kept, so alignment steps from there
+    instead of binary searching every keystroke.
+
+    As in IncrementalFilter, a longer query narrows the previous one's
+    matches, which stays correct for subsequences.
+    """
+    DELIMITERS = " -_/.,:;()[]'\"\n"
+    # Occurrences stepped over one at a time when seeking within a key,
+    # before falling back to a binary search
+    SEEK_STEPS = 4
+
+    def __init__(self, items, top_k=FUZZY_TOP_K):
+        super().__init__(items)
+        self.top_k = top_k
+        self._np = None
+        numpy = self._numpy() if len(items) >= FUZZY_VECTORIZE_MIN else None
+        if numpy is not None:
+            self._pack(numpy)
         else:
-            esc.SHOW_CURSOR = HIDE_CURSOR_ORIGINAL
-        return super().render(size, focus)
+            self.masks = [self._mask(key) for key in self.keys]
+        self._forward = None
+        self._ranked = {}
+
+    @staticmethod
+    def _numpy():
+        try:
+            import numpy
+        except ImportError:
+            return None
+        return numpy
+
+    def _added(self, start):
+        self._forward = None
+        self._ranked = {}
+        if self._np is not None:
+            self._append(self.keys[start:])
+            return
+        numpy = self._numpy() if len(self.keys) >= FUZZY_VECTORIZE_MIN else None
+        if numpy is not None:
+            self._pack(numpy)
+        else:
+            self.masks.extend(map(self._mask, self.keys[start:]))
+
+    def _join(self, found, added):
+        if self._np is None or isinstance(found, list) and isinstance(added, list):
+            return found + added
+        np = self._np
+        return np.concatenate((np.asarray(found, dtype=np.int64), np.asarray(added, dtype=np.int64)))
+
+    @staticmethod
+    def _mask(text):
+        mask = 0
+        for c in set(text):
+            mask |= 1 << (ord(c) & 63)
+        return mask
+
+    def _pack(self, np):
+        # Keys one after another, each preceded by a newline so position
+        # p - 1 is always valid and reads as a word boundary at the start.
+        # Characters outside latin-1 become '?'; such queries are matched
+        # key by key instead (see _scan).
+        # Packed a shard's worth at a time, so keys that are decoded on
+        # demand (MappedItems) never all exist as strings at once
+        self._np = np
+        chunks = []
+        base = 1
+        for first in range(0, len(self.keys), FILTER_SHARD_SIZE):
+            chunks.append(self._packed(self.keys[first:first + FILTER_SHARD_SIZE], base))
+            base += len(chunks[-1][0])
+        self.buffer, self.starts, self.lengths, self.masks = (np.concatenate(part) for part in zip(*chunks))
+        self.buffer = np.concatenate((np.frombuffer(b"\n", dtype=np.uint8), self.buffer))
+        self.ends = self.starts + self.lengths
+        self.boundary = np.zeros(256, dtype=np.int64)
+        self.boundary[list(self.DELIMITERS.encode())] = 8
+        self._occurrences = {}
+
+    def _packed(self, keys, base):
+        """Bytes of `keys`, each followed by a newline, with their starts (from `base`), lengths and masks."""
+        np = self._np
+        data = np.frombuffer(("\n".join(keys) + "\n").encode("latin-1", "replace"), dtype=np.uint8)
+        lengths = np.fromiter(map(len, keys), dtype=np.int64, count=len(keys))
+        starts = np.zeros(len(keys), dtype=np.int64)
+        np.cumsum(lengths[:-1] + 1, out=starts[1:])
+        bits = np.left_shift(np.uint64(1), (data & 63).astype(np.uint64))
+        return data, starts + base, lengths, np.bitwise_or.reduceat(bits, starts)
+
+    def _append(self, keys):
+        if not keys:
+            return
+        np = self._np
+        data, starts, lengths, masks = self._packed(keys, len(self.buffer))
+        size = len(self.buffer) + len(data)
+        for byte, (positions, firsts) in self._occurrences.items():
+            added = np.append(np.flatnonzero(data == byte) + len(self.buffer), size)
+            # Keys that pointed at the old end marker now point at the first added offset
+            positions = np.concatenate((positions[:-1], added))
+            firsts = np.concatenate((firsts, np.full(len(starts), -1, dtype=firsts.dtype)))
+            self._occurrences[byte] = (positions, self._indices(firsts, positions))
+        self.buffer = np.concatenate((self.buffer, data))
+        self.starts = np.concatenate((self.starts, starts))
+        self.lengths = np.concatenate((self.lengths, lengths))
+        self.ends = self.starts + self.lengths
+        self.masks = np.concatenate((self.masks, masks))
+
+    def _occurrences_of(self, byte, keys):
+        """
+        Sorted buffer offsets of `byte`, ending in one past the buffer, and
+        for each of `keys` the index among them of the first at or after
+        its start (key len(starts) starts at the end of the buffer). Both
+        are found on first use and kept, the latter key by key.
+        """
+        np = self._np
+        found = self._occurrences.get(byte)
+        if found is None:
+            positions = np.append(np.flatnonzero(self.buffer == byte), len(self.buffer))
+            firsts = self._indices(np.full(len(self.starts) + 1, -1), positions)
+            found = self._occurrences[byte] = (positions, firsts)
+        positions, firsts = found
+        index = firsts.take(keys)
+        missing = np.flatnonzero(index < 0)
+        if len(missing):
+            keys = keys.take(missing)
+            starts = np.where(keys < len(self.starts), self.starts.take(keys, mode="clip"), len(self.buffer))
+            index[missing] = firsts[keys] = np.searchsorted(positions, starts)
+        return positions, index
+
+    def _indices(self, values, positions):
+        """`values`, indices into `positions`, in four bytes each where that is enough."""
+        return values.astype(self._np.int32 if len(positions) < 1 << 31 else self._np.int64, copy=False)
+
+    def _seek(self, positions, index, cursor):
+        """
+        Move each `index` into `positions` on to the first offset at or
+        after its `cursor`; returns those offsets. Keys rarely repeat a
+        character, so a few steps forward usually get there.
+        """
+        np = self._np
+        at = positions.take(index)
+        behind = np.flatnonzero(at < cursor)
+        index = index.take(behind)
+        for _ in range(self.SEEK_STEPS):
+            if not len(behind):
+                return at
+            index += 1
+            at[behind] = found = positions.take(index)
+            still = np.flatnonzero(found < cursor.take(behind))
+            behind, index = behind.take(still), index.take(still)
+        if len(behind):
+            at[behind] = positions.take(np.searchsorted(positions, cursor.take(behind)))
+        return at
+
+    def _seek_back(self, positions, index, limit):
+        """Like _seek(), but to the last offset at or before each `limit`, stepping back."""
+        np = self._np
+        at = positions.take(index)
+        ahead = np.flatnonzero(at > limit)
+        index = index.take(ahead)
+        for _ in range(self.SEEK_STEPS):
+            if not len(ahead):
+                return at
+            index -= 1
+            at[ahead] = found = positions.take(index)
+            still = np.flatnonzero(found > limit.take(ahead))
+            ahead, index = ahead.take(still), index.take(still)
+        if len(ahead):
+            at[ahead] = positions.take(np.searchsorted(positions, limit.take(ahead), side="right") - 1)
+        return at
+
+    def _vectorizable(self, query):
+        if self._np is None:
+            return False
+        try:
+            query.encode("latin-1")
+        except UnicodeEncodeError:
+            return False
+        return True
+
+    def _scan(self, query, indices):
+        if not self._vectorizable(query):
+            return self._scan_keys(query, indices)
+        np = self._np
+        qmask = np.uint64(self._mask(query))
+        forward = self._forward
+        if indices is None:
+            candidates = np.flatnonzero((self.masks & qmask) == qmask)
+            cursor = self.starts[candidates]
+            rest = query
+        else:
+            indices = np.asarray(indices, dtype=np.int64)
+            keep = np.flatnonzero((self.masks.take(indices) & qmask) == qmask)
+            everything = len(keep) == len(indices)
+            candidates = indices if everything else indices.take(keep)
+            if forward is not None and forward[1] is indices and query.startswith(forward[0]):
+                # Typing on: the alignment of the shorter query still holds
+                cursor = (forward[2] if everything else forward[2].take(keep)) + 1
+                rest = query[len(forward[0]):]
+            else:
+                cursor = self.starts[candidates]
+                rest = query
+        # Leftmost alignment: each character's first occurrence after the last,
+        # seeking on from its first occurrence in the key
+        end = self.ends.take(candidates)
+        for byte in rest.encode("latin-1"):
+            positions, index = self._occurrences_of(byte, candidates)
+            at = self._seek(positions, index, cursor)
+            matched = np.flatnonzero(at < end)
+            candidates, at, end = candidates.take(matched), at.take(matched), end.take(matched)
+            cursor = at + 1
+        self._forward = (query, candidates, cursor - 1)
+        return candidates
+
+    def _scan_keys(self, query, indices):
+        keys = self.keys
+        if indices is None:
+            indices = range(len(keys))
+        if self._np is not None:
+            # The packed masks saw these characters as '?'
+            return [i for i in indices if self._align(keys[i], query) is not None]
+        qmask = self._mask(query)
+        masks = self.masks
+        return [i for i in indices
+                if masks[i] & qmask == qmask and self._align(keys[i], query) is not None]
+
+    def _align(self, key, query):
+        """
+        Positions of `query` in `key`: find the leftmost place the whole
+        query ends, then walk back from there so the match is as tight as
+        possible. None if it doesn't match.
+        """
+        end = -1
+        for c in query:
+            end = key.find(c, end + 1)
+            if end < 0:
+                return None
+        positions = []
+        for c in reversed(query):
+            end = key.rfind(c, 0, end + 1)
+            positions.append(end)
+            end -= 1
+        positions.reverse()
+        return positions
+
+    def _score(self, key, positions):
+        delimiters = self.DELIMITERS
+        bonuses = [8 if p == 0 or key[p - 1] in delimiters else 0 for p in positions]
+        score = 16 * len(positions) + sum(bonuses) + bonuses[0]
+        for previous, p in zip(positions, positions[1:]):
+            gap = p - previous - 1
+            score += 4 if gap == 0 else -3 - gap
+        return score
+
+    def rank(self, query):
+        """
+        The best matches for the lowercase `query`, as a list of item
+        indices and a list of matched character positions for each.
+        An empty query gives every item in catalog order, unhighlighted.
+        Rankings are kept for the queries matches() keeps, so
+        backspacing returns them straight away.
+        """
+        matches = self.matches(query)
+        if not query:
+            return matches, None
+        kept = {previous for previous, _ in self._results}
+        self._ranked = {previous: ranked for previous, ranked in self._ranked.items() if previous in kept}
+        ranked = self._ranked.get(query)
+        if ranked is None:
+            ranked = self._ranked[query] = self._rank(query, matches)
+        return ranked[:2]
+
+    def scores(self, query):
+        """The scores of rank(query)'s matches, in the same order."""
+        self.rank(query)
+        return self._ranked[query][2]
+
+    def _rank(self, query, matches):
+        if isinstance(matches, list):
+            return self._rank_keys(query, matches)
+        np = self._np
+        forward = self._forward
+        if forward is None or forward[0] != query or forward[1] is not matches:
+            self._scan(query, matches)
+            forward = self._forward
+        _, candidates, cursor = forward
+        if not len(candidates):
+            return [], [], []
+        # Walk back from where the leftmost alignment ended, seeking back
+        # from each character's last occurrence in the key; the last
+        # character stays where it is
+        aligned = np.empty((len(query), len(candidates)), dtype=np.int64)
+        aligned[-1] = cursor
+        for j, byte in reversed(list(enumerate(query[:-1].encode("latin-1")))):
+            positions, index = self._occurrences_of(byte, candidates + 1)
+            aligned[j] = self._seek_back(positions, index - 1, aligned[j + 1] - 1)
+        bonuses = self.boundary.take(self.buffer.take(aligned - 1))
+        scores = 16 * len(query) + bonuses.sum(axis=0) + bonuses[0]
+        if len(query) > 1:
+            gaps = aligned[1:] - aligned[:-1] - 1
+            scores += 4 * (gaps == 0).sum(axis=0) - 3 * (gaps > 0).sum(axis=0) - gaps.sum(axis=0)
+        # One sortable number per match: score, then length, then catalog order
+        lengths = self.lengths.take(candidates)
+        order = ((scores.max() - scores) * (lengths.max() + 1) + lengths) * len(self.keys) + candidates
+        if len(candidates) > self.top_k:
+            best = np.argpartition(order, self.top_k - 1)[:self.top_k]
+            order = best[np.argsort(order[best])]
+        else:
+            order = np.argsort(order)
+        ranked = candidates[order]
+        offsets = (aligned[:, order] - self.starts[ranked]).T
+        return ranked.tolist(), offsets.tolist(), scores[order].tolist()
+
+    def _rank_keys(self, query, matches):
+        keys = self.keys
+        scored = []
+        for i in matches:
+            positions = self._align(keys[i], query)
+            scored.append((self._score(keys[i], positions), -len(keys[i]), -i, positions))
+        best = heapq.nlargest(self.top_k, scored, key=lambda entry: entry[:3])
+        return [-entry[2] for entry in best], [entry[3] for entry in best], [entry[0] for entry in best]
+
+
+class ShardedMatcher:
+    """
+    FuzzyMatcher over worker processes, for catalogs too big to rank on
+    the UI thread between keystrokes. Items are cut into shards of
+    `shard_size`; each shard is copied into a shared memory segment once
+    and owned by one worker, which keeps a FuzzyMatcher for it, so a
+    query only sends its text and each worker narrows its own shards as
+    the query grows.
+
+    search() returns at once. Each shard's best matches come back as
+    they are ready and are merged into `ranked`, `highlights` and
+    `matched`, and on_results(first) is called on the main loop after
+    every merge, `first` being true for the first one of a query. A new
+    search cancels the previous one: workers skip shards whose query is
+    stale, and results that arrive for it anyway are dropped.
+    """
+    def __init__(self, items, on_results, workers, shard_size=FILTER_SHARD_SIZE, top_k=FUZZY_TOP_K):
+        import multiprocessing
+        self.items = items
+        self.on_results = on_results
+        self.shard_size = shard_size
+        self.top_k = top_k
+        self.query = ""
+        self.ranked = range(len(items))
+        self.highlights = None
+        self.matched = len(items)
+        self.pending = 0
+        self._best = []
+        self._found = {}
+        self._shown = False
+        self._segments = set()
+        # Spawned rather than forked: the UI has threads running by now
+        context = multiprocessing.get_context("spawn")
+        self._generation = context.RawValue("q", 0)
+        self._workers = []
+        for _ in range(workers):
+            conn, child = context.Pipe()
+            process = context.Process(target=_filter_worker, args=(child, self._generation, top_k),
+                                      daemon=True)
+            process.start()
+            child.close()
+            self._workers.append((process, conn))
+        self._publish(0)
+
+    def start(self, loop):
+        """Take results on `loop` from now on."""
+        for _, conn in self._workers:
+            loop.watch_file(conn.fileno(), lambda conn=conn: self._receive(loop, conn))
+
+    def extend(self, items):
+        """Add items; only the shards they land in are searched again."""
+        start = len(self.items)
+        self.items.extend(items)
+        changed = self._publish(start)
+        if not self.query:
+            self.ranked = range(len(self.items))
+            self.matched = len(self.items)
+            self.on_results(False)
+            return
+        self._search(changed)
+
+    def search(self, query):
+        """Start ranking the items against the lowercase `query`."""
+        self.query = query
+        self._generation.value += 1
+        self._best = []
+        self._found = {}
+        self._shown = False
+        if not query:
+            self.ranked = range(len(self.items))
+            self.highlights = None
+            self.matched = len(self.items)
+            self.pending = 0
+            self.on_results(True)
+            return
+        self.pending = 0
+        self._search(range(0, len(self.items), self.shard_size))
+
+    def _search(self, starts):
+        by_worker = collections.defaultdict(list)
+        for start in starts:
+            by_worker[start // self.shard_size % len(self._workers)].append(start)
+        for worker, assigned in by_worker.items():
+            self._workers[worker][1].send(("search", self._generation.value, self.query, assigned))
+            self.pending += len(assigned)
+        if not self.pending:
+            self._merge(None, 0, [])
+
+    def _publish(self, start):
+        """Copy the shards holding items from `start` on to their workers; returns their starts."""
+        from multiprocessing import shared_memory
+        size = self.shard_size
+        starts = range(start - start % size, len(self.items), size)
+        mapped = isinstance(self.items, MappedItems)
+        for first in starts:
+            if mapped:
+                # Workers map the file themselves and only need where the lines start
+                data = self.items.offsets[first:first + size].tobytes()
+            else:
+                data = "\n".join(self.items[first:first + size]).encode()
+            segment = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+            segment.buf[:len(data)] = data
+            segment.close()
+            self._segments.add(segment.name)
+            self._workers[first // size % len(self._workers)][1].send(
+                ("shard", first, segment.name, len(data), self.items.path if mapped else None))
+        return starts
+
+    def _receive(self, loop, conn):
+        try:
+            generation, start, matched, entries = conn.recv()
+        except (EOFError, OSError):
+            # The worker died; its shards stay pending
+            loop.remove_watch_file(conn.fileno())
+            return
+        if generation != self._generation.value:
+            return
+        self.pending -= 1
+        self._merge(start, matched, entries)
+
+    def _merge(self, start, matched, entries):
+        best = self._best
+        if start in self._found:
+            # The shard grew and was searched again; drop what it gave before
+            end = start + self.shard_size
+            best = [entry for entry in best if not start <= entry[0][2] < end]
+        if start is not None:
+            self._found[start] = matched
+        # Entries sort by score, then length, then catalog order, as FuzzyMatcher ranks them
+        self._best = list(itertools.islice(heapq.merge(best, entries), self.top_k))
+        self.ranked = [entry[0][2] for entry in self._best]
+        self.highlights = [entry[1] for entry in self._best]
+        self.matched = sum(self._found.values())
+        first, self._shown = not self._shown, True
+        self.on_results(first)
+
+    def close(self):
+        from multiprocessing import shared_memory
+        for process, conn in self._workers:
+            with contextlib.suppress(OSError):
+                conn.send(None)
+        for process, conn in self._workers:
+            process.join(1)
+            conn.close()
+        # Workers unlink the segments they read; clear up any they never got to
+        for name in self._segments:
+            with contextlib.suppress(FileNotFoundError):
+                segment = shared_memory.SharedMemory(name=name)
+                segment.close()
+                segment.unlink()
+
+
+def _filter_worker(conn, generation, top_k):
+    """
+    A ShardedMatcher worker. Between shards it takes any new messages
+    first, so a newer query or grown shard is seen straight away, and
+    when idle it builds the matchers for shards not searched yet.
+    """
+    from multiprocessing import shared_memory
+    # A little behind the UI for the CPU, so a busy worker doesn't delay
+    # a keystroke when there are fewer cores than workers
+    with contextlib.suppress(OSError):
+        os.nice(5)
+    shards = {}
+    cold = []
+    work = collections.deque()
+
+    def matcher(start):
+        shard = shards[start]
+        if not isinstance(shard, FuzzyMatcher):
+            shard = shards[start] = FuzzyMatcher(shard, top_k)
+        return shard
+
+    while True:
+        if conn.poll() or not work and not cold:
+            message = conn.recv()
+            if message is None:
+                return
+            if message[0] == "shard":
+                _, start, name, size, path = message
+                segment = shared_memory.SharedMemory(name=name)
+                data = bytes(segment.buf[:size])
+                segment.close()
+                segment.unlink()
+                if path is None:
+                    shards[start] = data.decode().split("\n")
+                else:
+                    shards[start] = MappedItems(path, array.array("q", data))
+                cold.append(start)
+            else:
+                _, current, query, starts = message
+                work = collections.deque(job for job in work if job[0] == current)
+                work.extend((current, query, start) for start in starts)
+            continue
+        if not work:
+            matcher(cold.pop())
+            continue
+        current, query, start = work.popleft()
+        if current != generation.value:
+            continue
+        shard = matcher(start)
+        indices, positions = shard.rank(query)
+        keys = shard.keys
+        entries = [((-score, len(keys[i]), start + i), offsets)
+                   for i, offsets, score in zip(indices, positions, shard.scores(query))]
+        conn.send((current, start, len(shard.matches(query)), entries))
+
+
+class FilteredItems:
+    """
+    Read-only sequence of `items` picked by `indices`, followed by `tail`,
+    for a VirtualListWalker; nothing is copied. Entries are (item,
+    positions) pairs, positions being the characters to highlight from
+    `highlights` (parallel to `indices`), or () without it.
+    """
+    def __init__(self, items, indices, tail, highlights=None):
+        self.items = items
+        self.indices = indices
+        self.tail = tail
+        self.highlights = highlights
+
+    def __len__(self):
+        return len(self.indices) + 1
+
+    def __getitem__(self, position):
+        if position == len(self.indices):
+            return self.tail
+        positions = self.highlights[position] if self.highlights else ()
+        return self.items[self.indices[position]], positions
+
+
+def highlight(text, positions, attr='match'):
+    """Markup for `text` with the characters at `positions` in `attr`."""
+    if not positions or positions[-1] >= len(text):
+        return text  # lower() changed the length; leave it plain
+    markup = []
+    last = 0
+    for p in positions:
+        if p > last:
+            markup.append(text[last:p])
+        if markup and isinstance(markup[-1], tuple) and p == last:
+            markup[-1] = (attr, markup[-1][1] + text[p])
+        else:
+            markup.append((attr, text[p]))
+        last = p + 1
+    if last < len(text):
+        markup.append(text[last:])
+    return markup
+
+
+class VirtualListBox(urwid.ListBox):
+    """
+    ListBox over a VirtualListWalker. Since every row is the same height,
+    the scrollbar's length and position come from index arithmetic instead
+    of measuring every row, so they stay O(1) however long the list is.
+    """
+    def require_relative_scroll(self, size, focus=False):
+        return False
+
+    def rows_max(self, size=None, focus=False):
+        return len(self.body) * self.body.row_height
+
+    def get_scrollpos(self, size=None, focus=False):
+        if not self.body:
+            return 0
+        if size is not None:
+            self._rendered_size = size
+        middle, _top, _bottom = self.calculate_visible(self._rendered_size, focus)
+        if middle is None:
+            return 0
+        # middle.offset is the focus row's distance from the top of the view
+        # (negative when its first lines are scrolled off).
+        return self.body.focus * self.body.row_height - middle.offset
+
+
+class NonTabSearchPile(urwid.Pile):
+    """
+    A custom Pile that forbids normal arrow or tab navigation into the search box.
+    The cursor shows only while the search box is focused; see CursorController.
+    """
 
     def keypress(self, size, key):
         if self.focus_position != 0:
@@ -140,22 +1281,378 @@ class NonTabSearchPile(urwid.Pile):
         return super().keypress(size, key)
 
 
+# Stands in for the Exit row at the end of the menu, so a catalog item
+# that happens to be called 'Exit' doesn't quit the program
+EXIT_ITEM = object()
+
+
+def user_cache_dir():
+    """Per-user cache directory shared by the TUIs (XDG on Unix, LOCALAPPDATA on Windows)."""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "tuis")
+
+
+def splash_art(text, font, width):
+    """
+    FIGlet rendering of `text`, wrapped at `width` columns. Renderings are
+    kept on disk by text, font and width, so pyfiglet is only imported
+    and run the first time a splash is shown at a given width.
+    """
+    key = hashlib.sha1(f"{text}\0{font}\0{width}".encode()).hexdigest()
+    path = os.path.join(user_cache_dir(), "splash", f"{key}.txt")
+    try:
+        with open(path, encoding="utf-8") as cached:
+            return cached.read()
+    except OSError:
+        pass
+    with startup_profile.timed("import pyfiglet"):
+        import pyfiglet
+    art = pyfiglet.figlet_format(text, font=font, width=width)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "w", encoding="utf-8") as cached:
+            cached.write(art)
+        os.replace(temp, path)
+    except OSError:
+        pass  # the cache is only a speed-up
+    return art
+
+
+class StartupProfile:
+    """
+    Startup timings for --profile-startup: the module's own imports,
+    modules imported later on first use, the first frame and the menu
+    becoming ready, in ms since the module started loading. Also lists
+    which of the heavier modules were loaded by the first frame.
+    """
+    WATCH = ("urwid", "pyfiglet", "requests", "urllib3", "ssl", "sqlite3", "PIL")
+
+    def __init__(self, started, imported):
+        self.started = started
+        self.events = [("module imports", started, imported)]
+        self.first_frame_modules = None
+
+    @contextlib.contextmanager
+    def timed(self, label):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.events.append((label, start, time.perf_counter()))
+
+    def mark(self, label):
+        now = time.perf_counter()
+        self.events.append((label, now, now))
+
+    def attach(self, screen):
+        """Mark the first frame `screen` draws."""
+        draw_screen = screen.draw_screen
+
+        def first_draw(size, canvas):
+            draw_screen(size, canvas)
+            self.mark("first frame")
+            self.first_frame_modules = [name for name in self.WATCH if name in sys.modules]
+            screen.draw_screen = draw_screen
+
+        screen.draw_screen = first_draw
+
+    def report(self):
+        lines = ["startup profile (ms since the first import):"]
+        for label, start, end in sorted(self.events, key=lambda event: event[1]):
+            took = f"  took {(end - start) * 1000:.1f}" if end > start else ""
+            lines.append(f"  {label:<24}{(start - self.started) * 1000:>8.1f}{took}")
+        if self.first_frame_modules is not None:
+            lines.append(f"  loaded by the first frame: {', '.join(self.first_frame_modules) or '-'}")
+            lines.append("  not yet loaded: " + (", ".join(
+                name for name in self.WATCH if name not in self.first_frame_modules) or "-"))
+        return "\n".join(lines)
+
+
+startup_profile = StartupProfile(IMPORT_START, IMPORT_END)
+
+
+class MappedItems:
+    """
+    Read-only sequence of the non-blank lines of a file, memory-mapped
+    and decoded only when an item is read, so a catalog costs 8 bytes an
+    item for the index of where its lines start rather than a str each.
+    Line endings (LF or CRLF) are not part of the items.
+
+    The index is saved next to the file as FILE.idx, and used again as
+    long as the file's size and modification time are unchanged.
+    `offsets` skips the index and uses those line starts instead.
+    """
+    INDEX_VERSION = 1
+
+    def __init__(self, path, offsets=None):
+        self.path = path
+        self._lower = False
+        with open(path, "rb") as file:
+            info = os.fstat(file.fileno())
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if info.st_size else b""
+        if offsets is not None:
+            self.offsets = offsets
+            self.longest = None
+            return
+        # Header: version, file size, mtime, line count, longest line in bytes
+        header = [self.INDEX_VERSION, info.st_size, info.st_mtime_ns]
+        index = f"{path}.idx"
+        try:
+            with open(index, "rb") as saved:
+                stored = array.array("q")
+                stored.fromfile(saved, 5)
+                if stored.tolist()[:3] != header:
+                    raise ValueError
+                self.offsets = array.array("q")
+                self.offsets.fromfile(saved, stored[3])
+                self.longest = stored[4]
+                return
+        except (OSError, EOFError, ValueError):
+            pass
+        self.offsets, self.longest = self._scan()
+        try:
+            temp = f"{index}.{os.getpid()}.tmp"
+            with open(temp, "wb") as saved:
+                array.array("q", header + [len(self.offsets), self.longest]).tofile(saved)
+                self.offsets.tofile(saved)
+            os.replace(temp, index)
+        except OSError:
+            pass  # the index is only a speed-up
+
+    def _scan(self):
+        """Where the non-blank lines start, and the longest one's length in bytes."""
+        data = self._map
+        size = len(data)
+        offsets = array.array("q")
+        if not size:
+            return offsets, 0
+        np = FuzzyMatcher._numpy()
+        if np is None:
+            longest = 0
+            position = 0
+            while position < size:
+                end = data.find(b"\n", position)
+                if end < 0:
+                    end = size
+                if end - position > 1 or end - position == 1 and data[position] != 13:
+                    offsets.append(position)
+                    longest = max(longest, end - position)
+                position = end + 1
+            return offsets, longest
+        longest = 0
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        start = 0
+        step = 1 << 24
+        for chunk in range(0, size + 1, step):
+            ends = np.flatnonzero(buffer[chunk:chunk + step] == 10) + chunk
+            if chunk + step > size:
+                ends = np.append(ends, size)  # the last line, ended or not
+            starts = np.concatenate(([start], ends[:-1] + 1))
+            if len(ends):
+                start = ends[-1] + 1
+            lengths = ends - starts
+            # A lone CR is a blank CRLF line
+            blank = (lengths == 0) | (lengths == 1) & (buffer[np.minimum(starts, size - 1)] == 13)
+            kept = ~blank
+            offsets.frombytes(starts[kept].astype(np.int64).tobytes())
+            if kept.any():
+                longest = max(longest, int(lengths[kept].max()))
+        return offsets, longest
+
+    def lowered(self):
+        """The same items, lowercased as they are read."""
+        view = MappedItems.__new__(MappedItems)
+        view.__dict__.update(self.__dict__)
+        view._lower = True
+        return view
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return self._lines(*position.indices(len(self))[:2])
+        start = self.offsets[position]
+        end = self._map.find(b"\n", start)
+        if end < 0:
+            end = len(self._map)
+        line = self._map[start:end].decode("utf-8", "replace")
+        if line.endswith("\r"):
+            line = line[:-1]
+        return line.lower() if self._lower else line
+
+    def __iter__(self):
+        for first in range(0, len(self), FILTER_SHARD_SIZE):
+            yield from self[first:first + FILTER_SHARD_SIZE]
+
+    def _lines(self, first, last):
+        """Items first to last, decoded with one call for the span they cover."""
+        if first >= last:
+            return []
+        end = self._map.find(b"\n", self.offsets[last - 1])
+        if end < 0:
+            end = len(self._map)
+        text = self._map[self.offsets[first]:end].decode("utf-8", "replace")
+        if text.endswith("\r"):
+            text = text[:-1]
+        if self._lower:
+            text = text.lower()
+        # Blank lines in the span are not items
+        return [line for line in text.replace("\r\n", "\n").split("\n") if line]
+
+
+class ItemSource:
+    """
+    Reads menu items, one per line, from a file, stdin ("-") or the output
+    of a shell command, on a background thread. Lines are handed to the
+    main loop through a watched pipe at most every `interval` seconds, so
+    the UI takes a few large batches rather than a wakeup per line.
+    """
+    def __init__(self, spec, command=False, interval=0.1):
+        self.interval = interval
+        self.process = None
+        if command:
+            self.title = spec
+            self.process = subprocess.Popen(spec, shell=True, stdin=subprocess.DEVNULL,
+                                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            self.stream = self.process.stdout
+        elif spec == "-":
+            self.title = "stdin"
+            self.stream = sys.stdin.buffer
+        else:
+            self.title = os.path.basename(spec)
+            self.stream = open(spec, "rb")
+        info = os.fstat(self.stream.fileno())
+        # Only a regular file's size says how much is left to read
+        self.total_bytes = info.st_size if stat.S_ISREG(info.st_mode) else None
+        self.read_bytes = 0
+        self.done = False
+        self._lock = threading.Lock()
+        self._pending = []
+
+    def start(self, loop, on_items):
+        """Start reading; on_items(items) is called on the main loop for each batch."""
+        self._on_items = on_items
+        self._pipe_fd = loop.watch_pipe(self._drain)
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        rest = b""
+        sent = 0
+        while True:
+            data = self.stream.read1(1 << 16)
+            if not data:
+                break
+            lines = (rest + data).split(b"\n")
+            rest = lines.pop()
+            self._add(lines, len(data))
+            if time.monotonic() - sent >= self.interval:
+                sent = time.monotonic()
+                os.write(self._pipe_fd, b"\0")
+        self._add([rest], 0)
+        self.done = True
+        os.write(self._pipe_fd, b"\0")
+
+    def _add(self, lines, size):
+        text = b"\n".join(lines).decode("utf-8", "replace").replace("\r", "")
+        with self._lock:
+            self._pending.extend(line for line in text.split("\n") if line)
+            self.read_bytes += size
+
+    def _drain(self, data):
+        with self._lock:
+            items, self._pending = self._pending, []
+        self._on_items(items)
+        return True
+
+    def progress(self):
+        """Percentage of a regular file read so far, or None."""
+        if not self.total_bytes:
+            return None
+        return 100 * self.read_bytes // self.total_bytes
+
+    def close(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+
+
 class MenuController:
-    def __init__(self):
-        self.menu_items = [
-            'Apples', 'Bananas', 'Avocado', 'Grapes', 'Oranges',
-            'Pineapple', 'Mango', 'Strawberries', 'Blueberries', 'Peaches',
-            'Cherries', 'Watermelon', 'Lemon', 'Lime', 'Kiwi',
-            'Papaya', 'Passion Fruit', 'Dragon Fruit', 'Pomegranate', 'Coconut'
-        ]
+    def __init__(self, source=None, workers=0):
+        """
+        Without a `source`, the menu is the built-in fruit list. With an
+        ItemSource, it becomes a picker over the lines it reads: they are
+        added as they arrive, and choosing one quits with it in `picked`.
+        A MappedItems source is a picker over a file read in place.
+        Given `workers` as well, the picker's filtering runs in that many
+        processes (see ShardedMatcher) instead of on the UI thread.
+        """
+        self.source = source
+        if source is None:
+            self.menu_items = [
+                'Apples', 'Bananas', 'Avocado', 'Grapes', 'Oranges',
+                'Pineapple', 'Mango', 'Strawberries', 'Blueberries', 'Peaches',
+                'Cherries', 'Watermelon', 'Lemon', 'Lime', 'Kiwi',
+                'Papaya', 'Passion Fruit', 'Dragon Fruit', 'Pomegranate', 'Coconut'
+            ]
+            self.title = "Fruits"
+        elif isinstance(source, MappedItems):
+            self.menu_items = source
+            self.title = os.path.basename(source.path)
+        else:
+            self.menu_items = []
+            self.title = source.title
+        self.sharded = source is not None and workers > 0
+        if self.sharded:
+            self.menu_filter = ShardedMatcher(self.menu_items, self.show_results, workers)
+        else:
+            self.menu_filter = FuzzyMatcher(self.menu_items)
         self.footer = urwid.Text("", align='center')
+        self.status = urwid.Text("", align='right', wrap='ellipsis')
+        self.query = ""
+        self.matched = len(self.menu_items)
+        self.picked = None
+        self.loaded = False
         self.menu_list = None
         self.menu_content = None
-        self.MAX_OPTION_LENGTH = max(len(item) for item in self.menu_items + ['Exit'])
+        self.loop = None
+        self.splash = None
+        if isinstance(self.menu_items, MappedItems):
+            self.MAX_OPTION_LENGTH = max(self.menu_items.longest, len('Exit'))
+        else:
+            self.MAX_OPTION_LENGTH = max(len(item) for item in self.menu_items + ['Exit'])
+
+    def add_items(self, items):
+        """New lines from the source; the list and counter follow along."""
+        self.menu_filter.extend(items)
+        if self.source.done and not self.loaded:
+            # The catalog lives as long as the menu; once it is all in, moving
+            # it out of the collector's generations keeps full collections
+            # from walking millions of items while typing
+            self.loaded = True
+            gc.freeze()
+        if self.menu_list is not None and not self.sharded:
+            # A ShardedMatcher searches the new items itself
+            self.show_matches(keep_focus=True)
+
+    def update_status(self):
+        text = f"{self.matched:,}/{len(self.menu_items):,}"
+        if self.sharded and self.menu_filter.pending:
+            text += " searching..."
+        if isinstance(self.source, ItemSource) and not self.source.done:
+            progress = self.source.progress()
+            text += " loaded" + (f" ({progress}%)" if progress is not None else "") + "..."
+        self.status.set_text(text)
 
     def menu_handler(self, button, choice):
+        if self.source is not None:
+            self.picked = choice.item
+            raise urwid.ExitMainLoop()
         # Grab the selected menu item's label for the footer
-        selected_text = choice.get_caption()
+        selected_text = choice.item
         self.footer.set_text(('center', f"You chose: {selected_text}"))
 
     def exit_program(self, button):
@@ -163,27 +1660,62 @@ class MenuController:
 
     def handle_search_input(self, edit, text):
         """
-        Rebuilds the entire list based on the search text
-        to ensure proper rendering (including arrow indicators).
+        Called on every change to the search text. The filter runs once per
+        burst of input, before the next frame, so a paste filters only once.
+        """
+        self.loop.defer(self.filter_menu, text)
+
+    def filter_menu(self, text):
+        """
+        Fuzzy-matches the items against the search text, best first, with
+        the matched characters highlighted. Typing narrows the previous
+        matches rather than rescanning every item, and only the rows on
+        screen exist as widgets, so this just swaps the walker's item view.
         """
-        # Clear everything from the listwalker
-        self.menu_list.clear()
+        self.query = text.strip().lower()
+        self.show_matches()
+
+    def show_matches(self, keep_focus=False):
+        if self.sharded:
+            # The list follows along in show_results as workers report
+            self.menu_filter.search(self.query)
+            self.update_status()
+            return
+        matches, highlights = self.menu_filter.rank(self.query)
+        self.matched = len(self.menu_filter.matches(self.query))
+        self.show_ranked(matches, highlights, keep_focus)
+
+    def show_results(self, first):
+        if self.menu_list is None:
+            return
+        self.matched = self.menu_filter.matched
+        self.show_ranked(self.menu_filter.ranked, self.menu_filter.highlights, keep_focus=not first)
+
+    def show_ranked(self, matches, highlights, keep_focus):
+        # Always include an Exit option at the end; reset focus to the
+        # top item so navigation remains consistent, unless new items
+        # came in underneath
+        focus = min(self.menu_list.focus, len(matches)) if keep_focus else 0
+        self.menu_list.set_items(FilteredItems(self.menu_items, matches, EXIT_ITEM, highlights), focus)
+        self.update_status()
 
-        # Add matching buttons
-        for item in self.menu_items:
-            if text.strip().lower() in item.lower():
-                button = MenuButton(item)
-                urwid.connect_signal(button, 'click', self.menu_handler, user_args=[button])
-                self.menu_list.append(button)
+    def make_row(self):
+        button = MenuButton('')
+        urwid.connect_signal(button, 'click', self.row_clicked)
+        return button
 
-        # Always include an Exit option at the end
-        exit_button = MenuButton('Exit')
-        urwid.connect_signal(exit_button, 'click', self.exit_program)
-        self.menu_list.append(exit_button)
+    def bind_row(self, button, item):
+        if item is EXIT_ITEM:
+            button.bind('Exit', item)
+        else:
+            text, positions = item
+            button.bind(highlight(text, positions), text)
 
-        # Optionally reset focus to the top item so navigation remains consistent
-        if len(self.menu_list) > 0:
-            self.menu_list.set_focus(0)
+    def row_clicked(self, button):
+        if button.item is EXIT_ITEM:
+            self.exit_program(button)
+        else:
+            self.menu_handler(button, button)
 
     def create_menu(self):
         # Create the search box (with cursor visible)
@@ -200,19 +1732,13 @@ class MenuController:
             blcorner='└', bline='─', brcorner='┘'
         )
 
-        # Create default menu items
-        body = []
-        for item in self.menu_items:
-            button = MenuButton(item)
-            urwid.connect_signal(button, 'click', self.menu_handler, user_args=[button])
-            body.append(button)
-
-        exit_button = MenuButton('Exit')
-        urwid.connect_signal(exit_button, 'click', self.exit_program)
-        body.append(exit_button)
-
-        self.menu_list = urwid.SimpleFocusListWalker(body)
-        listbox = urwid.ListBox(self.menu_list)
+        # Create default menu items; rows are built lazily for the visible window
+        self.menu_list = VirtualListWalker(
+            FilteredItems(self.menu_items, (), EXIT_ITEM),
+            self.make_row, self.bind_row
+        )
+        self.show_matches()
+        listbox = VirtualListBox(self.menu_list)
         scrollbar = urwid.AttrMap(urwid.ScrollBar(listbox), None)
 
         # Compose the NonTabSearchPile
@@ -220,12 +1746,12 @@ class MenuController:
             ('pack', search_box),
             ('pack', urwid.Divider()),
             scrollbar,
-            ('pack', urwid.Divider())
+            ('pack', self.status)
         ])
 
         menu_box = urwid.LineBox(
             self.menu_content,
-            title="Fruits",
+            title=self.title,
             title_attr='title-col',
             tlcorner='┏', tline='━', lline='┃',
             trcorner='┓', blcorner='┗', rline='┃',
@@ -239,23 +1765,36 @@ class MenuController:
         self.menu_content.focus_position = 0
 
     def handle_key(self, key):
-        if key in ('q', 'Q', 'esc'):
+        if self.splash is not None:
+            # Any key skips the splash
+            self.show_menu(self.loop, None)
+        elif key in ('q', 'Q', 'esc'):
             raise urwid.ExitMainLoop()
         elif key in ('n', 'N'):
             self.focus_search_box()
+        elif key == 'enter' and self.source is not None:
+            # ENTER in the search box picks the best match
+            self.row_clicked(self.menu_list[self.menu_list.focus])
+        elif key in ('b', 'B') and isinstance(self.loop.screen, LowBandwidthScreen):
+            self.footer.set_text(('center', self.loop.screen.stats()))
 
     def show_splash_screen(self, loop, user_data):
-        # Generate ASCII art using pyfiglet
-        ascii_art = pyfiglet.figlet_format("AnimePaheDL", font="slant")
+        self.loop = loop
+        # Generate ASCII art using pyfiglet, or read it back from the cache
+        cols, _ = loop.screen.get_cols_rows()
+        ascii_art = splash_art("AnimePaheDL", "slant", cols)
         # Wrap the ASCII art in an AttrMap to color it red
         splash_text = urwid.Text(ascii_art, align='center')
         splash = urwid.AttrMap(splash_text, 'splash-col')
-        filler = urwid.Filler(splash, valign='middle')
-        loop.widget = filler
-        # Set a timer to transition to the menu after 2 seconds
-        loop.set_alarm_in(2, self.show_menu)
+        self.splash = urwid.Filler(splash, valign='middle')
+        loop.widget = self.splash
+        # Build the menu as soon as the splash is up, instead of after a fixed delay
+        loop.set_alarm_in(0, self.show_menu)
 
     def show_menu(self, loop, user_data):
+        if self.splash is None:
+            return  # already skipped with a key
+        self.splash = None
         menu = self.create_menu()
         main = urwid.Pile([
             menu,
@@ -272,21 +1811,84 @@ class MenuController:
             height=('relative', 30)
         )
         loop.widget = top
+        startup_profile.mark("menu ready")
 
 
 if __name__ == "__main__":
-    controller = MenuController()
-    loop = urwid.MainLoop(
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--low-bandwidth", action="store_true",
+                        help="repaint only the changed parts of each row, for slow SSH links; "
+                             "press b to show bytes written per frame")
+    parser.add_argument("--colors", type=int, choices=(16, 256),
+                        help="terminal colours to use (default: detected from $TERM)")
+    parser.add_argument("--fps", type=int, default=60,
+                        help="most frames drawn per second (default: 60)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print import, first-frame and menu-ready timings to stderr on exit")
+    items = parser.add_mutually_exclusive_group()
+    items.add_argument("--items", metavar="FILE",
+                       help="pick from the lines of FILE (- for stdin) instead of the fruit list; "
+                            "the choice is printed on exit. A regular file is memory-mapped, with its "
+                            "line index saved as FILE.idx")
+    items.add_argument("--command", metavar="CMD",
+                       help="pick from the lines a shell command prints")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="processes filtering --items or --command lines, for catalogs "
+                             "of millions of lines (default: 0, filter on the UI thread)")
+    args = parser.parse_args()
+
+    source = None
+    screen_files = {}
+    if args.items or args.command:
+        try:
+            if args.items and args.items != "-" and os.path.isfile(args.items):
+                # Read in place, decoding only the lines shown or matched
+                source = MappedItems(args.items)
+            else:
+                source = ItemSource(args.command or args.items, command=bool(args.command))
+        except OSError as e:
+            sys.exit(f"{args.command or args.items}: {e.strerror}")
+        # The picker draws on the terminal even when stdin or stdout is a pipe
+        if args.items == "-":
+            screen_files["input"] = open("/dev/tty")
+        if not sys.stdout.isatty():
+            screen_files["output"] = open("/dev/tty", "w")
+
+    controller = MenuController(source, workers=args.workers)
+    loop = ScheduledMainLoop(
         urwid.SolidFill(' '),
         palette=[
             ("title-col", "dark red", ""),
             ('center', 'default', ''),
             ('bold', 'bold', ''),
             # New style below for coloring the splash text
-            ('splash-col', 'light cyan', '')
+            ('splash-col', 'light cyan', ''),
+            # Characters matched by the search
+            ('match', 'yellow', '')
         ],
-        unhandled_input=controller.handle_key
+        unhandled_input=controller.handle_key,
+        screen=LowBandwidthScreen(low_bandwidth=args.low_bandwidth, **screen_files),
+        fps=args.fps
     )
+    if controller.sharded:
+        controller.menu_filter.start(loop)
+    if isinstance(source, ItemSource):
+        source.start(loop, controller.add_items)
+    if args.colors:
+        loop.screen.set_terminal_properties(colors=args.colors)
+    CursorController().attach(loop.screen)
+    if args.profile_startup:
+        startup_profile.attach(loop.screen)
     # Start with the splash screen
     loop.set_alarm_in(0, controller.show_splash_screen)
-    loop.run()
+    try:
+        loop.run()
+    finally:
+        if isinstance(source, ItemSource):
+            source.close()
+        if controller.sharded:
+            controller.menu_filter.close()
+        if args.profile_startup:
+            print(startup_profile.report(), file=sys.stderr)
+    if controller.picked is not None:
+        print(controller.picked)
@@ -0,0 +1,71 @@
+"""
+Cost of rendering one counter value in counter.py: pf.figlet_format()
+(the old per-keypress path, which loads and parses the font every call),
+Figlet.renderText() on an already-parsed font, and GlyphCache.render().
+
+Also checks that GlyphCache gives exactly figlet_format()'s text for
+every value rendered.
+
+    python benchmarks/bench_counter_glyphs.py [--font big] [--values 2000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+import pyfiglet as pf
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import counter  # noqa: E402
+
+
+def per_call(func, values, repeat):
+    """Median seconds per call over `repeat` passes through `values`."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in values:
+            func(value)
+        runs.append((time.perf_counter() - start) / len(values))
+    return statistics.median(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--font", default=counter.font, help=f"FIGlet font (default: {counter.font})")
+    parser.add_argument("--values", type=int, default=2000, help="integers rendered per pass (default: 2000)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    # Mostly key-repeat territory around zero, plus some long numbers
+    values = [rng.randint(-500, 500) for _ in range(args.values - args.values // 10)]
+    values += [rng.randint(-10 ** 12, 10 ** 12) for _ in range(args.values // 10)]
+
+    start = time.perf_counter()
+    glyphs = counter.GlyphCache(args.font)
+    build = time.perf_counter() - start
+
+    # figlet_format wraps at 80 columns; the counter shows one unwrapped line
+    width = 1 << 30
+    figlet = pf.Figlet(font=args.font, width=width)
+    slow_values = values[:max(1, len(values) // 20)]
+    results = {
+        "figlet_format()": per_call(lambda n: pf.figlet_format(f"{n}", font=args.font, width=width),
+                                    slow_values, 1),
+        "renderText()": per_call(lambda n: figlet.renderText(f"{n}"), values, args.repeat),
+        "GlyphCache": per_call(glyphs.render, values, args.repeat),
+    }
+
+    mismatches = sum(glyphs.render(n) != figlet.renderText(f"{n}") for n in values)
+    print(f"font {args.font!r}, {len(values)} values, GlyphCache built in {build * 1000:.1f}ms")
+    baseline = results["figlet_format()"]
+    for name, seconds in results.items():
+        print(f"{name:<16}{seconds * 1e6:>10.1f}us  {baseline / seconds:>8.0f}x")
+    print(f"mismatches against figlet_format(): {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
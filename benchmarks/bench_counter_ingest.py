@@ -0,0 +1,72 @@
+"""
+Events per second counter.py's dashboard can absorb: a writer thread
+pushes "<name> <delta>" lines through a pipe as fast as it can while
+EventIngest reads them and a consumer drains take() at the dashboard's
+frame rate, as Dashboard.tick does.
+
+    python benchmarks/bench_counter_ingest.py [--events 2000000] [--counters 5000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import counter  # noqa: E402
+
+
+def synthetic_events(count, counters, seed=0):
+    rng = random.Random(seed)
+    names = [f"service{i}.requests".encode() for i in range(counters)]
+    deltas = [b"+", b"+", b"-", b"+3", b"-2"]
+    return b"".join(rng.choice(names) + b" " + rng.choice(deltas) + b"\n" for _ in range(count))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=2_000_000, help="lines written (default: 2000000)")
+    parser.add_argument("--counters", type=int, default=5000, help="distinct counter names (default: 5000)")
+    parser.add_argument("--fps", type=int, default=30, help="rate take() is drained at (default: 30)")
+    args = parser.parse_args()
+
+    # Build a chunk once and write it repeatedly so the writer isn't the bottleneck
+    lines = min(args.events, 200_000)
+    chunk = synthetic_events(lines, args.counters)
+    passes, rest = divmod(args.events, lines)
+    # The first `rest` lines of the chunk make up the difference
+    tail = b"".join(chunk.splitlines(keepends=True)[:rest])
+
+    read_fd, write_fd = os.pipe()
+
+    def write():
+        with os.fdopen(write_fd, "wb") as out:
+            for _ in range(passes):
+                out.write(chunk)
+            out.write(tail)
+
+    ingest = counter.EventIngest()
+    totals = {}
+    batches = 0
+    start = time.perf_counter()
+    writer = threading.Thread(target=write)
+    reader = threading.Thread(target=ingest.read, args=(lambda size: os.read(read_fd, size),))
+    writer.start()
+    reader.start()
+    while reader.is_alive() or ingest.pending:
+        time.sleep(1 / args.fps)
+        for name, delta in ingest.take().items():
+            totals[name] = totals.get(name, 0) + delta
+        batches += 1
+    elapsed = time.perf_counter() - start
+    writer.join()
+    os.close(read_fd)
+
+    print(f"{ingest.events:,} events over {len(totals):,} counters in {elapsed:.2f}s "
+          f"({batches} batches)")
+    print(f"{ingest.events / elapsed:,.0f} events/s, {ingest.malformed} malformed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Sustained increments per second through counter.py's CounterStore:
+no persistence, the log with durability off (written but never
+fsynced), group commit (the default: one fsync per flush interval),
+and an fsync after every increment for comparison.
+
+Also times reopening a store with a long history, which only reads the
+latest snapshot and the log after it.
+
+    python benchmarks/bench_counter_store.py [--seconds 2] [--dir /tmp]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import counter  # noqa: E402
+
+
+def sustained(add, seconds, sync=None):
+    """Increments per second from calling add() for `seconds`."""
+    rng = random.Random(0)
+    names = [f"counter{i}" for i in range(100)]
+    done = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            add(rng.choice(names), 1)
+        done += 100
+    if sync:
+        sync()
+    return done / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2, help="time spent on each mode (default: 2)")
+    parser.add_argument("--dir", default=None, help="directory for the store files (default: a temp dir)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as folder:
+        values = {}
+        results = {"in memory": sustained(lambda name, delta: values.__setitem__(name, values.get(name, 0) + delta),
+                                          args.seconds)}
+
+        for label, durable in (("log, no fsync", False), ("group commit", True)):
+            store = counter.CounterStore(os.path.join(folder, label.replace(" ", "_")), durable=durable)
+            results[label] = sustained(store.add, args.seconds, store.sync)
+            store.close()
+
+        store = counter.CounterStore(os.path.join(folder, "per_increment"))
+
+        def add_and_sync(name, delta):
+            store.add(name, delta)
+            store.sync()
+        results["fsync each"] = sustained(add_and_sync, args.seconds)
+        store.close()
+
+        print(f"{'':<16}{'increments/s':>14}")
+        for label, rate in results.items():
+            print(f"{label:<16}{rate:>14,.0f}")
+
+        # A long history: many snapshots' worth of increments, then reopen
+        path = os.path.join(folder, "history")
+        store = counter.CounterStore(path, durable=False)
+        history = 2_000_000
+        for i in range(history):
+            store.add(f"counter{i % 1000}", 1)
+        store.close()
+        start = time.perf_counter()
+        store = counter.CounterStore(path)
+        reopen = time.perf_counter() - start
+        assert sum(store.values.values()) == history
+        store.close()
+        print(f"reopening after {history:,} increments: {reopen * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Per-keystroke cost of filtering the fruit menu in app.py on a large
+catalog: the old filter_menu (lowercase every item, copy the matches,
+append Exit) against IncrementalFilter + FilteredItems. Both hand the
+result to the same VirtualListWalker and fetch a screenful of rows, as
+a redraw would.
+
+The query is typed one character at a time and then erased.
+
+    python benchmarks/bench_fruit_filter.py [--items 1000000] [--query "passion fr"]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import app  # noqa: E402
+
+SCREEN_ROWS = 40
+
+
+def synthetic_menu(count, seed=0):
+    rng = random.Random(seed)
+    fruits = app.MenuController().menu_items
+    kinds = ["Red", "Golden", "Wild", "Dwarf", "Giant", "Sweet", "Sour", "Baby", "Blood", "Snow"]
+    return [f"{rng.choice(kinds)} {rng.choice(fruits)} {i}" for i in range(count)]
+
+
+def old_filter(items, query):
+    matches = [(item, ()) for item in items if query in item.lower()]
+    matches.append(app.EXIT_ITEM)
+    return matches
+
+
+def keystrokes(query):
+    typed = [query[:i] for i in range(1, len(query) + 1)]
+    return typed + typed[-2::-1] + [""]
+
+
+def run(walker, filter_items, queries):
+    """Seconds per keystroke, and the match counts seen."""
+    times, counts = [], []
+    for query in queries:
+        start = time.perf_counter()
+        items = filter_items(query)
+        walker.set_items(items)
+        for position in range(min(SCREEN_ROWS, len(walker))):
+            walker[position]
+        times.append(time.perf_counter() - start)
+        counts.append(len(walker) - 1)
+    return times, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000, help="menu size (default: 1000000)")
+    parser.add_argument("--query", default="passion fr", help='text typed (default: "passion fr")')
+    args = parser.parse_args()
+
+    items = synthetic_menu(args.items)
+    controller = app.MenuController()
+    queries = keystrokes(args.query.lower())
+
+    start = time.perf_counter()
+    menu_filter = app.IncrementalFilter(items)
+    build = time.perf_counter() - start
+
+    walker = app.VirtualListWalker([], controller.make_row, controller.bind_row)
+    old_times, old_counts = run(walker, lambda query: old_filter(items, query), queries)
+    walker = app.VirtualListWalker([], controller.make_row, controller.bind_row)
+    new_times, new_counts = run(
+        walker, lambda query: app.FilteredItems(items, menu_filter.matches(query), app.EXIT_ITEM), queries)
+    assert old_counts == new_counts
+
+    print(f"{len(items):,} items, keys lowercased once in {build * 1000:.0f}ms")
+    print(f"{'query':<16}{'matches':>10}{'old':>12}{'incremental':>14}")
+    for query, count, old, new in zip(queries, new_counts, old_times, new_times):
+        print(f"{query!r:<16}{count:>10,}{old * 1000:>10.1f}ms{new * 1000:>12.2f}ms")
+    print(f"{'total':<26}{sum(old_times) * 1000:>10.1f}ms{sum(new_times) * 1000:>12.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Per-keystroke cost of the fuzzy menu search in app.py (FuzzyMatcher.rank)
+on a large catalog, typing a query one character at a time, erasing it
+and typing it again: bitmask pruning plus NumPy alignment and scoring, against the same
+ranking done key by key in Python (with --python; slow at 1M items).
+
+Both must return the same top matches. The first pass includes finding
+each character's occurrences in the packed keys, and where each key's
+first one is, the first time it is typed; the second pass is the
+steady state.
+
+    python benchmarks/bench_fuzzy_rank.py [--items 1000000] [--query pasfru] [--python]
+"""
+import gc
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import app  # noqa: E402
+
+
+def synthetic_menu(count, seed=0):
+    rng = random.Random(seed)
+    fruits = app.MenuController().menu_items
+    kinds = ["Red", "Golden", "Wild", "Dwarf", "Giant", "Sweet", "Sour", "Baby", "Blood", "Snow"]
+    return [f"{rng.choice(kinds)} {rng.choice(fruits)} {i}" for i in range(count)]
+
+
+def keystrokes(query):
+    typed = [query[:i] for i in range(1, len(query) + 1)]
+    return typed + typed[-2::-1] + [""] + typed
+
+
+def build(items, vectorize):
+    app.FUZZY_VECTORIZE_MIN = 0 if vectorize else len(items) + 1
+    start = time.perf_counter()
+    matcher = app.FuzzyMatcher(items)
+    return matcher, time.perf_counter() - start
+
+
+def run(matcher, queries):
+    times, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(matcher.rank(query))
+        times.append(time.perf_counter() - start)
+    return times, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000, help="menu size (default: 1000000)")
+    parser.add_argument("--query", default="pasfru", help="text typed (default: pasfru)")
+    parser.add_argument("--python", action="store_true", help="also time the pure-Python ranking")
+    args = parser.parse_args()
+
+    items = synthetic_menu(args.items)
+    queries = keystrokes(args.query.lower())
+    matchers = {"numpy": build(items, True)}
+    if args.python:
+        matchers["python"] = build(items, False)
+    gc.freeze()  # as MenuController does once the catalog is loaded
+
+    timings = {}
+    for name, (matcher, setup) in matchers.items():
+        print(f"{name}: built in {setup * 1000:.0f}ms for {len(items):,} items")
+        timings[name], results = run(matcher, queries)
+        if name != "numpy":
+            assert results == timings_results, f"{name} ranks differently"
+        else:
+            timings_results = results
+    shown = [len(matcher.matches(query)) for query in queries]
+
+    print(f"{'query':<12}{'matches':>10}" + "".join(f"{name:>12}" for name in timings))
+    for i, query in enumerate(queries):
+        print(f"{query!r:<12}{shown[i]:>10,}" + "".join(f"{t[i] * 1000:>10.1f}ms" for t in timings.values()))
+    for name, times in timings.items():
+        warm = times[-len(args.query):]
+        print(f"{name}: worst keystroke {max(times) * 1000:.1f}ms (a character typed for the first time), "
+              f"worst on the second pass {max(warm) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Time to first row and peak memory for a Jikan search page:
+resp.json() on the whole body (the old perform_search) against the
+streaming JikanPageParser + AnimeRecord path in jikanApp.
+
+A local HTTP server plays the API, sending a synthetic page in small
+chunks at a fixed bandwidth so the difference in time to first row shows.
+
+    python benchmarks/bench_jikan_decode.py [--records 25] [--kbps 2000]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import tracemalloc
+import statistics
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import jikanApp  # noqa: E402
+
+
+def synthetic_anime(mal_id):
+    """A record shaped like a full Jikan v4 /anime search result."""
+    url = f"https://cdn.myanimelist.net/images/anime/{mal_id}/{mal_id}"
+    people = [{"mal_id": i, "type": "anime", "name": f"Company {i}", "url": f"https://myanimelist.net/{i}"}
+              for i in range(4)]
+    return {
+        "mal_id": mal_id,
+        "url": f"https://myanimelist.net/anime/{mal_id}",
+        "images": {fmt: {"image_url": f"{url}.{fmt}", "small_image_url": f"{url}t.{fmt}",
+                         "large_image_url": f"{url}l.{fmt}"} for fmt in ("jpg", "webp")},
+        "trailer": {"youtube_id": None, "url": None, "embed_url": None,
+                    "images": {key: None for key in ("image_url", "small_image_url", "medium_image_url",
+                                                     "large_image_url", "maximum_image_url")}},
+        "approved": True,
+        "titles": [{"type": kind, "title": f"Title {mal_id} {kind}"}
+                   for kind in ("Default", "Synonym", "Japanese", "English")],
+        "title": f"Title {mal_id}",
+        "title_english": f"English Title {mal_id}",
+        "title_japanese": f"タイトル {mal_id}",
+        "title_synonyms": [f"Synonym {mal_id}"],
+        "type": "TV", "source": "Manga", "episodes": 24, "status": "Finished Airing", "airing": False,
+        "aired": {"from": "2002-10-03T00:00:00+00:00", "to": "2007-02-08T00:00:00+00:00",
+                  "prop": {"from": {"day": 3, "month": 10, "year": 2002},
+                           "to": {"day": 8, "month": 2, "year": 2007}},
+                  "string": "Oct 3, 2002 to Feb 8, 2007"},
+        "duration": "23 min per ep", "rating": "PG-13 - Teens 13 or older",
+        "score": 8.0, "scored_by": 123456, "rank": 600, "popularity": 10, "members": 2000000,
+        "favorites": 70000,
+        "synopsis": "A long synopsis sentence about the show. " * 40,
+        "background": "Some background on the production. " * 10,
+        "season": "fall", "year": 2002,
+        "broadcast": {"day": "Thursdays", "time": "19:30", "timezone": "Asia/Tokyo",
+                      "string": "Thursdays at 19:30 (JST)"},
+        "producers": people, "licensors": people[:2], "studios": people[:1],
+        "genres": people, "explicit_genres": [], "themes": people[:2], "demographics": people[:1],
+    }
+
+
+def synthetic_page(records):
+    return json.dumps({
+        "pagination": {"last_visible_page": 40, "has_next_page": True, "current_page": 1,
+                       "items": {"count": records, "total": 1000, "per_page": records}},
+        "data": [synthetic_anime(i) for i in range(records)],
+    }).encode()
+
+
+def serve(body, kbps):
+    chunk = 4096
+    delay = chunk / (kbps * 1024)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            for start in range(0, len(body), chunk):
+                self.wfile.write(body[start:start + chunk])
+                self.wfile.flush()
+                time.sleep(delay)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_full(session, base_url):
+    """The old path: wait for the body, build the whole dict tree, keep titles."""
+    start = time.perf_counter()
+    resp = session.get(f"{base_url}/anime", params={"q": "bench"}, timeout=30)
+    data = resp.json().get("data", [])
+    first_row = time.perf_counter() - start
+    titles = [anime.get("title", "Unknown Title") for anime in data]
+    return first_row, time.perf_counter() - start, len(titles)
+
+
+def run_streaming(client, base_url):
+    """The new path: rows are usable as soon as each record has parsed."""
+    first = []
+    start = time.perf_counter()
+    result = jikanApp.fetch_anime(
+        client, "bench", on_records=lambda batch: first or first.append(time.perf_counter() - start)
+    )
+    return first[0], time.perf_counter() - start, len(result["data"])
+
+
+def measure(func, *args, repeat):
+    first_rows, totals, peaks = [], [], []
+    for _ in range(repeat):
+        tracemalloc.start()
+        first_row, total, count = func(*args)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        first_rows.append(first_row)
+        totals.append(total)
+    return statistics.median(first_rows), statistics.median(totals), max(peaks), count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=25, help="records per page (default: 25)")
+    parser.add_argument("--kbps", type=float, default=2000, help="simulated bandwidth in KiB/s (default: 2000)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    body = synthetic_page(args.records)
+    server = serve(body, args.kbps)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    unlimited = jikanApp.RateLimiter(((1_000_000, 1.0),))
+
+    print(f"{args.records} records, {len(body) / 1024:.0f} KiB body at {args.kbps:.0f} KiB/s")
+    print(f"{'':<12}{'first row':>12}{'all rows':>12}{'peak memory':>14}")
+    results = {
+        "resp.json()": measure(run_full, requests.Session(), base_url, repeat=args.repeat),
+        "streaming": measure(run_streaming, jikanApp.JikanClient(base_url, limiter=unlimited), base_url,
+                             repeat=args.repeat),
+    }
+    for name, (first_row, total, peak, count) in results.items():
+        assert count == args.records, (name, count)
+        print(f"{name:<12}{first_row * 1000:>10.1f}ms{total * 1000:>10.1f}ms{peak / 1024:>11.0f}KiB")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
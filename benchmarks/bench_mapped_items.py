@@ -0,0 +1,92 @@
+"""
+Memory and open time of a picker catalog in app.py as the file grows:
+every line read into a list of str (what ItemSource builds) against
+MappedItems, opened the first time (scanning the file and saving
+FILE.idx) and again (loading the saved index).
+
+Each measurement runs in a fresh process. "private" is the process's
+anonymous resident memory (RssAnon) added by opening the catalog; the
+mapped file's own pages are shared page cache and are not counted.
+
+    python benchmarks/bench_mapped_items.py [--sizes 1000000,2000000,5000000,10000000]
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import app  # noqa: E402
+from bench_fuzzy_rank import synthetic_menu  # noqa: E402
+
+
+def private_memory():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def measure(kind, path):
+    """Runs in the child: open the catalog, then read random items from it."""
+    before = private_memory()
+    start = time.perf_counter()
+    if kind == "list":
+        with open(path, "rb") as file:
+            items = [line for line in file.read().decode("utf-8", "replace").replace("\r", "").split("\n") if line]
+    else:
+        items = app.MappedItems(path)
+    opened = time.perf_counter() - start
+    rng = random.Random(0)
+    picks = [rng.randrange(len(items)) for _ in range(10_000)]
+    start = time.perf_counter()
+    for i in picks:
+        items[i]
+    read = (time.perf_counter() - start) / len(picks)
+    print(json.dumps({"open": opened, "read": read, "private": private_memory() - before, "count": len(items)}))
+
+
+def run(kind, path):
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), "--measure", kind, path],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def write_catalog(path, count):
+    with open(path, "w", encoding="utf-8") as file:
+        for seed, first in enumerate(range(0, count, 1_000_000)):
+            file.write("\n".join(synthetic_menu(min(1_000_000, count - first), seed)) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000000,2000000,5000000,10000000",
+                        help="comma-separated line counts (default: 1M, 2M, 5M, 10M)")
+    parser.add_argument("--measure", nargs=2, metavar=("KIND", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure:
+        measure(*args.measure)
+        return
+
+    print(f"{'lines':>11}  {'catalog':<14}{'open':>10}{'read':>10}{'private':>12}{'per line':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in map(int, args.sizes.split(",")):
+            path = os.path.join(directory, f"{count}.txt")
+            write_catalog(path, count)
+            # The index is written by the first open and loaded by the second
+            for name, kind in (("list of str", "list"), ("mapped, scan", "mapped"), ("mapped, saved", "mapped")):
+                result = run(kind, path)
+                assert result["count"] == count, (name, result["count"])
+                print(f"{count:>11,}  {name:<14}{result['open'] * 1000:>8.0f}ms{result['read'] * 1e6:>8.1f}us"
+                      f"{result['private'] / 2 ** 20:>10.1f}MB{result['private'] / count:>9.1f}B")
+            os.remove(path)
+            os.remove(f"{path}.idx")
+
+
+if __name__ == "__main__":
+    main()
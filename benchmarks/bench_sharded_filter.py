@@ -0,0 +1,103 @@
+"""
+Fuzzy search over a large picker catalog in app.py with ShardedMatcher,
+for a range of worker counts, against FuzzyMatcher.rank() on the UI
+thread (what --workers 0 does).
+
+For each keystroke of a query typed, erased and typed again: the time
+until the first shard's matches are shown and until all of them are,
+and the longest the UI thread was busy at a stretch (sending the query,
+or taking one shard's results). Everything must agree with the
+in-process ranking.
+
+    python benchmarks/bench_sharded_filter.py [--items 2000000] [--workers 1,2,4]
+"""
+import gc
+import os
+import sys
+import time
+import argparse
+
+import urwid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import app  # noqa: E402
+from bench_fuzzy_rank import synthetic_menu, keystrokes  # noqa: E402
+
+
+class Timed:
+    """Runs a ShardedMatcher on its own event loop, timing each search."""
+    def __init__(self, items, workers):
+        self.loop = urwid.SelectEventLoop()
+        self.matcher = app.ShardedMatcher([], self.on_results, workers)
+        self.matcher.extend(items)
+        gc.freeze()  # as MenuController does once the catalog is loaded
+        self.matcher.start(self.loop)
+        receive = self.matcher._receive
+
+        def timed_receive(loop, conn):
+            start = time.perf_counter()
+            receive(loop, conn)
+            self.busy = max(self.busy, time.perf_counter() - start)
+            if not self.matcher.pending:
+                raise urwid.ExitMainLoop()
+        self.matcher._receive = timed_receive
+
+    def on_results(self, first):
+        if first:
+            self.first = time.perf_counter() - self.start
+
+    def search(self, query):
+        self.first = 0
+        self.start = time.perf_counter()
+        self.matcher.search(query)
+        self.busy = time.perf_counter() - self.start
+        if self.matcher.pending:
+            self.loop.run()
+        return self.first, time.perf_counter() - self.start, self.busy
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=2_000_000, help="catalog size (default: 2000000)")
+    parser.add_argument("--query", default="pasfru", help="text typed (default: pasfru)")
+    parser.add_argument("--workers", default=",".join(str(n) for n in (1, 2, 4, 8, 16) if n <= cores) or "1",
+                        help=f"comma-separated worker counts (default: powers of two up to {cores})")
+    args = parser.parse_args()
+
+    items = synthetic_menu(args.items)
+    queries = keystrokes(args.query.lower())
+    typed = len(args.query)
+
+    reference = app.FuzzyMatcher(list(items))
+    gc.freeze()
+    inline = []
+    for query in queries:
+        start = time.perf_counter()
+        reference.rank(query)
+        inline.append(time.perf_counter() - start)
+    print(f"{len(items):,} items in {-(-len(items) // app.FILTER_SHARD_SIZE)} shards, {cores} CPUs")
+    print(f"UI thread: worst keystroke {max(inline) * 1000:.1f}ms, "
+          f"{max(inline[-typed:]) * 1000:.1f}ms on the second pass")
+
+    print(f"{'workers':<9}{'first shard':>13}{'all shards':>12}{'UI busy':>10}{'items/s':>14}{'speedup':>9}")
+    base = None
+    for workers in map(int, args.workers.split(",")):
+        timed = Timed(items, workers)
+        timed.search("#")  # let every worker build its shards' matchers
+        results = [timed.search(query) for query in queries]
+        for query in queries:
+            timed.search(query)
+            ranked, _ = reference.rank(query)
+            assert list(timed.matcher.ranked) == list(ranked), f"{workers} workers rank {query!r} differently"
+        timed.matcher.close()
+        # The first keystroke after warming up scans every item; later ones narrow
+        full = results[0][1]
+        base = base or full
+        first, total, busy = (max(column) for column in zip(*results[-typed:]))
+        print(f"{workers:<9}{first * 1000:>11.1f}ms{total * 1000:>10.1f}ms{busy * 1000:>8.1f}ms"
+              f"{len(items) / full:>14,.0f}{base / full:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,558 @@
+import os
+import sys
+import json
+import errno
+import stat
+import socket
+import argparse
+import threading
+import collections
 import pyfiglet as pf
 import time as t
-from urwid import Text, Filler, MainLoop, ExitMainLoop
+from urwid import Text, Filler, Frame, AttrMap, MainLoop, ExitMainLoop, Widget, TextCanvas
+from urwid.display.raw import Screen
 
 palette = [
     ("red", '', '', '', '#d00', ''),
     ("blue", '', '', '', '#0ad', ''),
     ("white", '', '', '', '#fff', ''),
+    ("focus", 'black', 'light gray', '', '#000', '#0ad'),
 ]
 
 font = 'big'
+# Largest first; numbers too wide for all of them are shown as plain text
+fonts = (font, 'standard', 'small')
+
+
+class GlyphCache:
+    """
+    Renders integers in a FIGlet font without going through figlet_format().
+
+    The font is parsed once, every digit and the minus sign is laid out
+    once, and so is the join between each pair of them (FIGlet smushes
+    neighbouring glyphs together). A number is then spliced together from
+    cached glyph rows, which gives the same text as figlet_format() as long
+    as each join only depends on its two glyphs. The rare joins that reach
+    further back (a glyph narrower than its two overlaps) fall back to the
+    already-parsed Figlet.
+    """
+    def __init__(self, font, chars="-0123456789"):
+        # No wrapping: one line of glyphs however long the number gets
+        self.figlet = pf.Figlet(font=font, width=1 << 30)
+        self.glyphs = {c: self._rows(c) for c in chars}
+        self.widths = {c: len(rows[0]) for c, rows in self.glyphs.items()}
+        self.blank_rows = {c: any(not row.strip() for row in rows) for c, rows in self.glyphs.items()}
+        self.segments = {}
+        self.joins = {}
+        for a in chars:
+            for b in chars:
+                pair = self._rows(a + b)
+                overlap = self.widths[a] + self.widths[b] - len(pair[0])
+                start = self.widths[a] - overlap
+                self.joins[a, b] = (overlap, [row[start:start + overlap] for row in pair])
+        # Columns a glyph takes before the next one starts, for bounding
+        # the width of an n-character number without rendering it
+        advances = [self.widths[a] - overlap for (a, b), (overlap, _) in self.joins.items()]
+        self.advance = (min(advances), max(advances))
+        self.last_width = (min(self.widths.values()), max(self.widths.values()))
+        self.height = len(self.glyphs[chars[0]])
+
+    def width_bounds(self, length):
+        """Narrowest and widest a rendered number of `length` characters can be."""
+        return tuple((length - 1) * advance + width for advance, width in zip(self.advance, self.last_width))
+
+    def _rows(self, text):
+        return self.figlet.renderText(text).split("\n")[:-1]
+
+    def render(self, num):
+        text = f"{num}"
+        segments = []
+        left = 0  # columns of the current glyph already taken by its left join
+        for i, (prev, c) in enumerate(zip(text, text[1:])):
+            overlap, junction = self.joins[prev, c]
+            width = self.widths[prev]
+            if i and (left + overlap > width or (overlap >= width and self.blank_rows[prev])):
+                return self.figlet.renderText(text)
+            segments.append(self._segment(prev, left, overlap))
+            segments.append(junction)
+            left = overlap
+        segments.append(self._segment(text[-1], left, 0))
+        return "\n".join(map("".join, zip(*segments))) + "\n"
+
+    def _segment(self, c, left, right):
+        """Rows of glyph c without the columns its joins replace."""
+        rows = self.segments.get((c, left, right))
+        if rows is None:
+            end = self.widths[c] - right
+            rows = self.segments[c, left, right] = [row[left:end] for row in self.glyphs[c]]
+        return rows
+
+
+class FontLadder:
+    """
+    Picks the largest font a number fits in at a given width.
+
+    Each font's width bounds for the number's length settle almost every
+    choice without rendering anything, so a number far too long for a
+    font costs nothing in it. Only when a font might just fit is the
+    number rendered and measured, and that is remembered until the number
+    changes, so resizing never renders the same thing twice.
+    """
+    def __init__(self, fonts):
+        self.fonts = [GlyphCache(font) for font in fonts]
+        self.num = None
+        self.rendered = {}
+
+    def render(self, num, maxcol):
+        if num != self.num:
+            self.num = num
+            self.rendered = {}
+        length = len(f"{num}")
+        for glyphs in self.fonts:
+            narrowest, widest = glyphs.width_bounds(length)
+            if narrowest > maxcol:
+                continue
+            art = self.rendered.get(glyphs)
+            if art is None:
+                art = self.rendered[glyphs] = glyphs.render(num)
+            if widest <= maxcol or art.index("\n") <= maxcol:
+                return art
+        return f"{num}"
+
+
+class BigNumber(Widget):
+    """
+    Flow widget showing a number in the largest font of a FontLadder
+    that fits the width it is rendered at.
+    """
+    _sizing = frozenset(['flow'])
+
+    def __init__(self, ladder, num, attr):
+        super().__init__()
+        self.ladder = ladder
+        self.text = Text("", 'center', wrap='any')
+        self.set_value(num, attr)
+
+    def set_value(self, num, attr):
+        self.num = num
+        self.attr = attr
+        self._invalidate()
+
+    def _text(self, maxcol):
+        self.text.set_text((self.attr, self.ladder.render(self.num, maxcol)))
+        return self.text
+
+    def rows(self, size, focus=False):
+        return self._text(size[0]).rows(size)
+
+    def render(self, size, focus=False):
+        return self._text(size[0]).render(size)
+
+
+class EventIngest:
+    """
+    Folds "<name> <delta>" event lines (delta like +1, -3, or a bare + or -)
+    into per-counter totals on background threads, away from the UI.
+
+    Sources are read in large chunks and identical lines are counted
+    together before being parsed, so a stream of repeated increments
+    costs a handful of dict updates per chunk rather than per event.
+    take() hands the totals gathered since the last call to the UI.
+    """
+    CHUNK = 1 << 16
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.events = 0
+        self.malformed = 0
+
+    def take(self):
+        with self.lock:
+            batch, self.pending = self.pending, {}
+        return batch
+
+    def add(self, lines):
+        deltas = {}
+        events = malformed = 0
+        for line, n in collections.Counter(lines).items():
+            name, _, delta = line.strip().rpartition(b" ")
+            if not name:
+                malformed += n if delta else 0  # blank lines are fine
+                continue
+            try:
+                step = 1 if delta == b"+" else -1 if delta == b"-" else int(delta)
+            except ValueError:
+                malformed += n
+                continue
+            name = name.decode("utf-8", "replace")
+            deltas[name] = deltas.get(name, 0) + step * n
+            events += n
+        with self.lock:
+            for name, delta in deltas.items():
+                self.pending[name] = self.pending.get(name, 0) + delta
+            self.events += events
+            self.malformed += malformed
+
+    def read(self, read):
+        """Consume one stream, given its read(size) function, until EOF."""
+        rest = b""
+        while True:
+            data = read(self.CHUNK)
+            if not data:
+                break
+            lines = (rest + data).split(b"\n")
+            rest = lines.pop()
+            self.add(lines)
+        if rest:
+            self.add([rest])
+
+    def start(self, source):
+        """
+        Start reading `source` in the background: "-" for stdin,
+        "unix:PATH" to listen for any number of writers on a Unix socket,
+        or the path of a FIFO (reopened for every writer) or file.
+        """
+        if source == "-":
+            target = lambda: self.read(lambda size: os.read(0, size))
+        elif source.startswith("unix:"):
+            path = source[len("unix:"):]
+            try:
+                # A socket left by an earlier run; anything else is kept
+                if not stat.S_ISSOCK(os.lstat(path).st_mode):
+                    raise FileExistsError(errno.EEXIST, "exists and is not a socket", path)
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(path)
+            server.listen()
+            target = lambda: self._serve(server)
+        else:
+            target = lambda: self._follow(source)
+        threading.Thread(target=target, daemon=True).start()
+
+    def _serve(self, server):
+        while True:
+            conn, _ = server.accept()
+            threading.Thread(target=self.read, args=(conn.recv,), daemon=True).start()
+
+    def _follow(self, path):
+        while True:
+            with open(path, "rb", buffering=0) as stream:
+                self.read(stream.read)
+            if not stat.S_ISFIFO(os.stat(path).st_mode):
+                break
+
+
+class CounterGrid(Widget):
+    """
+    Box widget showing counters as a grid of fixed-width cells. Only the
+    rows on screen are formatted, straight into a TextCanvas, so it
+    costs the same with ten counters or ten thousand.
+    """
+    _sizing = frozenset(['box'])
+    _selectable = True
+    CELL = 24
+
+    def __init__(self, names, values):
+        super().__init__()
+        self.names = names
+        self.values = values
+        self.current = 0
+        self.top = 0
+
+    def refresh(self):
+        self._invalidate()
+
+    def render(self, size, focus=False):
+        maxcol, maxrow = size
+        # Narrower than one cell: a single column, cut to fit
+        width = min(self.CELL, maxcol)
+        cols = max(1, maxcol // self.CELL)
+        focus_row = self.current // cols
+        self.top = min(max(self.top, focus_row - maxrow + 1), focus_row)
+        text, attr = [], []
+        for row in range(self.top, self.top + maxrow):
+            line, runs = b"", []
+            for i in range(row * cols, min((row + 1) * cols, len(self.names))):
+                name = self.names[i]
+                value = self.values[name]
+                cell = f" {name[:self.CELL - 12]:<{self.CELL - 12}}{value:>10} "[:width]
+                line += cell.encode("ascii", "replace")
+                style = 'focus' if i == self.current else 'blue' if value >= 0 else 'red'
+                runs.append((style, width))
+            text.append(line.ljust(maxcol))
+            attr.append(runs)
+        return TextCanvas(text, attr, maxcol=maxcol)
+
+    def keypress(self, size, key):
+        maxcol, maxrow = size
+        cols = max(1, maxcol // self.CELL)
+        moves = {'left': -1, 'right': 1, 'up': -cols, 'down': cols,
+                 'page up': -cols * maxrow, 'page down': cols * maxrow}
+        if key in moves:
+            self.current += moves[key]
+        elif key == 'home':
+            self.current = 0
+        elif key == 'end':
+            self.current = len(self.names) - 1
+        else:
+            return key
+        self.current = max(0, min(self.current, len(self.names) - 1))
+        self._invalidate()
+        return None
+
+
+class Dashboard:
+    """
+    Counters fed by an EventIngest. A frame tick at a fixed rate applies
+    everything that arrived since the previous one and redraws once;
+    ticks that come round too late to keep that rate count as dropped
+    frames.
+    """
+    def __init__(self, ingest, fps=30, store=None):
+        self.ingest = ingest
+        self.interval = 1 / fps
+        self.store = store
+        self.values = dict(store.values) if store else {}
+        self.names = list(self.values)
+        self.grid = CounterGrid(self.names, self.values)
+        self.status = Text(('white', ""))
+        self.widget = Frame(AttrMap(self.grid, 'blue'), footer=self.status)
+        self.dropped = 0
+        self.due = 0
+        self.rate = 0
+        self.rate_since = (t.monotonic(), 0)
+
+    def tick(self, loop=None, user_data=None):
+        now = t.monotonic()
+        missed = int((now - self.due) / self.interval) if self.due else 0
+        self.dropped += missed
+        self.due = (self.due or now) + (missed + 1) * self.interval
+
+        batch = self.ingest.take()
+        if self.store:
+            self.store.add_many(batch)
+        for name, delta in batch.items():
+            if name not in self.values:
+                self.names.append(name)
+                self.values[name] = 0
+            self.values[name] += delta
+        if batch:
+            self.grid.refresh()
+
+        since, events = self.rate_since
+        if now - since >= 1:
+            self.rate = (self.ingest.events - events) / (now - since)
+            self.rate_since = (now, self.ingest.events)
+        self.status.set_text(('white',
+            f" {self.rate:,.0f} events/s  {len(self.names):,} counters  "
+            f"{self.dropped:,} dropped frames  {self.ingest.malformed:,} bad lines  q: quit"))
+        if loop is not None:
+            loop.set_alarm_in(max(0, self.due - t.monotonic()), self.tick)
+
+    def keys(self, key):
+        if (key in ['q', 'Q', 'esc']):
+            raise ExitMainLoop()
+
+
+class CounterStore:
+    """
+    Counter values kept on disk as an append-only log plus snapshots.
+
+    Every change is appended to the current log as a "<name> <delta>"
+    line. A flusher thread writes the lines gathered since its last pass
+    and fsyncs them together (group commit), so a change is durable
+    within `sync_interval` seconds, and sync() makes it durable right
+    away. Once `snapshot_every` changes are logged, the log is rotated
+    and the values are written as a snapshot that records the first log
+    it does not cover. Logs older than that are then removed.
+
+    Loading reads the snapshot and replays only the logs after it, so
+    startup time depends on `snapshot_every` and not on the length of
+    the history. A torn last line from a crash is dropped.
+    """
+    def __init__(self, path, sync_interval=0.05, snapshot_every=100_000, durable=True):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.snapshot_every = snapshot_every
+        self.durable = durable
+        self.values = {}
+        self.lock = threading.Lock()        # values and the unwritten lines
+        self.write_lock = threading.Lock()  # the log file and snapshots
+        self.buffer = []
+        self.logged = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.generation = self._load()
+        self.log = open(self._log_path(self.generation), "ab", buffering=0)
+        self.stopped = threading.Event()
+        self.flusher = threading.Thread(target=self._run, daemon=True)
+        self.flusher.start()
+
+    def _log_path(self, generation):
+        return f"{self.path}.{generation}.log"
+
+    def _logs(self):
+        prefix = os.path.basename(self.path) + "."
+        folder = os.path.dirname(os.path.abspath(self.path))
+        generations = []
+        for entry in os.listdir(folder):
+            middle = entry[len(prefix):-len(".log")]
+            if entry.startswith(prefix) and entry.endswith(".log") and middle.isdigit():
+                generations.append(int(middle))
+        return sorted(generations)
+
+    def _load(self):
+        first = 0
+        try:
+            with open(f"{self.path}.snapshot") as snapshot:
+                state = json.load(snapshot)
+            self.values, first = state["values"], state["log"]
+        except FileNotFoundError:
+            pass
+        generations = [g for g in self._logs() if g >= first] or [first]
+        for generation in generations:
+            self._replay(self._log_path(generation))
+        return generations[-1]
+
+    def _replay(self, path):
+        try:
+            with open(path, "rb") as log:
+                data = log.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            # Torn write: cut it off so new lines don't get appended to it
+            with open(path, "r+b") as log:
+                log.truncate(end)
+        for line in data[:end].splitlines():
+            name, _, delta = line.rpartition(b" ")
+            name = name.decode("utf-8", "replace")
+            self.values[name] = self.values.get(name, 0) + int(delta)
+            self.logged += 1
+
+    def add(self, name, delta):
+        with self.lock:
+            self.values[name] = self.values.get(name, 0) + delta
+            self.buffer.append(f"{name} {delta}\n")
+            return self.values[name]
+
+    def add_many(self, deltas):
+        with self.lock:
+            for name, delta in deltas.items():
+                self.values[name] = self.values.get(name, 0) + delta
+            self.buffer.extend(f"{name} {delta}\n" for name, delta in deltas.items())
+
+    def sync(self):
+        """Write and fsync everything added so far."""
+        with self.write_lock:
+            with self.lock:
+                lines, self.buffer = self.buffer, []
+            self._write(self.log, lines)
+            if self.logged >= self.snapshot_every:
+                self._compact()
+
+    def _compact(self):
+        # Called with write_lock held. Rotating under self.lock makes the
+        # copied values exactly what the logs before the new one hold.
+        with self.lock:
+            lines, self.buffer = self.buffer, []
+            values = dict(self.values)
+            old = self.log
+            self.generation += 1
+            self.log = open(self._log_path(self.generation), "ab", buffering=0)
+        self._write(old, lines)
+        old.close()
+        self.logged = 0
+        temp = f"{self.path}.snapshot.tmp"
+        with open(temp, "w") as snapshot:
+            json.dump({"log": self.generation, "values": values}, snapshot)
+            snapshot.flush()
+            if self.durable:
+                os.fsync(snapshot.fileno())
+        os.replace(temp, f"{self.path}.snapshot")
+        for generation in self._logs():
+            if generation < self.generation:
+                os.remove(self._log_path(generation))
+
+    def _write(self, log, lines):
+        if lines:
+            log.write("".join(lines).encode())
+            if self.durable:
+                os.fsync(log.fileno())
+            self.logged += len(lines)
+
+    def _run(self):
+        while not self.stopped.wait(self.sync_interval):
+            self.sync()
+
+    def close(self):
+        self.stopped.set()
+        self.flusher.join()
+        # A clean exit leaves only a snapshot to read next time
+        with self.write_lock:
+            self._compact()
+        self.log.close()
+
 
 def Exit(key):
     global num, bg
     if (key in ['q', 'Q', 'esc']):
         raise ExitMainLoop()
     elif (key in '+'):
-        num += 1
-        ascii_rt = pf.figlet_format(f"{num}", font=font)
-        if (num >= 0):
-            txt.set_text(('blue', f"{ascii_rt}"))
-        else:
-            txt.set_text(('red', f"{ascii_rt}"))
+        num = store.add("num", 1) if store else num + 1
+        number.set_value(num, 'blue' if num >= 0 else 'red')
     elif (key in '-'):
-        num -= 1
-        ascii_rt = pf.figlet_format(f"{num}", font=font)
-        if (num >= 0):
-            txt.set_text(('blue', f"{ascii_rt}"))
-        else:
-            txt.set_text(('red', f"{ascii_rt}"))
+        num = store.add("num", -1) if store else num - 1
+        number.set_value(num, 'blue' if num >= 0 else 'red')
+
+def run_dashboard(source, fps, store):
+    ingest = EventIngest()
+    try:
+        ingest.start(source)
+    except OSError as e:
+        sys.exit(f"{source}: {e.strerror}")
+    dashboard = Dashboard(ingest, fps, store)
+    # With events on stdin, the keyboard has to come from the terminal
+    screen = Screen(input=open("/dev/tty")) if source == "-" else Screen()
+    loop = MainLoop(dashboard.widget, palette, screen=screen, unhandled_input=dashboard.keys)
+    loop.screen.set_terminal_properties(256)
+    loop.set_alarm_in(0, dashboard.tick)
+    loop.run()
 
-num = 0
-ascii_rt = pf.figlet_format(f"{num}", font=font)
-txt = Text(('white',  f"{ascii_rt}"), 'center')
-fill = Filler(txt)
 
-loop = MainLoop(fill, palette, unhandled_input=Exit)
-loop.screen.set_terminal_properties(256)
-loop.run()
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", metavar="SOURCE",
+                        help='show a dashboard of counters fed by "<name> <delta>" lines from SOURCE: '
+                             '- for stdin, unix:PATH to listen on a Unix socket, or a FIFO or file path')
+    parser.add_argument("--fps", type=int, default=30,
+                        help="dashboard redraws per second (default: 30)")
+    parser.add_argument("--state", metavar="PATH",
+                        help="where counter values are kept between runs "
+                             "(default: ~/.counter/counter, or ~/.counter/dashboard with --events)")
+    parser.add_argument("--no-state", action="store_true", help="start from zero and keep nothing")
+    args = parser.parse_args()
+
+    store = None
+    if not args.no_state:
+        state = args.state or os.path.expanduser(
+            "~/.counter/dashboard" if args.events else "~/.counter/counter")
+        store = CounterStore(state)
+
+    try:
+        if args.events:
+            run_dashboard(args.events, args.fps, store)
+        else:
+            num = store.values.get("num", 0) if store else 0
+            number = BigNumber(FontLadder(fonts), num, 'white')
+            fill = Filler(number)
+
+            loop = MainLoop(fill, palette, unhandled_input=Exit)
+            loop.screen.set_terminal_properties(256)
+            loop.run()
+    finally:
+        if store:
+            store.close()
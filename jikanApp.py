@@ -1,14 +1,944 @@
-import sys
 import time
-import pyfiglet
+IMPORT_START = time.perf_counter()
+import os
+import sys
+import hashlib
+import errno
+import json
+import queue
+import heapq
+import sqlite3
+import argparse
+import itertools
+import codecs
+import contextlib
+import threading
+import collections
+from io import BytesIO
+from concurrent.futures import Future
+import importlib.util
 import urwid
-import urwid.escape as esc
-import requests
+# requests is imported on first use, after the first frame (JikanClient.session)
+IMPORT_END = time.perf_counter()
 
 # Constants for cursor control
 SHOW_CURSOR = "\x1b[?25h"
 HIDE_CURSOR = "\x1b[?25l"
 
+JIKAN_API_URL = "https://api.jikan.moe/v4"
+
+# Jikan allows 3 requests per second and 60 per minute.
+JIKAN_RATE_LIMITS = ((3, 1.0), (60, 60.0))
+
+# Request priorities for the rate limiter; lower is sent first.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+# Start fetching the next page once focus is this many rows from the end.
+PREFETCH_MARGIN = 10
+
+# Prefetch details for the focused row and this many rows either side of
+# it, with at most DETAIL_PREFETCH_WORKERS detail requests in flight.
+DETAIL_PREFETCH_RADIUS = 2
+DETAIL_PREFETCH_WORKERS = 2
+
+# Poster thumbnail sizes in terminal cells (columns, rows). Each cell is
+# one upper-half block, i.e. two vertically stacked pixels.
+THUMB_ROW_SIZE = (4, 3)
+THUMB_DETAIL_SIZE = (16, 12)
+
+# Channel levels of the xterm 256-color 6x6x6 cube.
+XTERM_CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+
+
+def user_cache_dir():
+    """Per-user cache directory shared by the TUIs (XDG on Unix, LOCALAPPDATA on Windows)."""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "tuis")
+
+
+def default_cache_path():
+    os.makedirs(user_cache_dir(), exist_ok=True)
+    return os.path.join(user_cache_dir(), "jikan.sqlite3")
+
+
+def splash_art(text, font, width):
+    """
+    FIGlet rendering of `text`, wrapped at `width` columns. Renderings are
+    kept on disk by text, font and width, so pyfiglet is only imported
+    and run the first time a splash is shown at a given width.
+    """
+    key = hashlib.sha1(f"{text}\0{font}\0{width}".encode()).hexdigest()
+    path = os.path.join(user_cache_dir(), "splash", f"{key}.txt")
+    try:
+        with open(path, encoding="utf-8") as cached:
+            return cached.read()
+    except OSError:
+        pass
+    with startup_profile.timed("import pyfiglet"):
+        import pyfiglet
+    art = pyfiglet.figlet_format(text, font=font, width=width)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "w", encoding="utf-8") as cached:
+            cached.write(art)
+        os.replace(temp, path)
+    except OSError:
+        pass  # the cache is only a speed-up
+    return art
+
+
+class StartupProfile:
+    """
+    Startup timings for --profile-startup: the module's own imports,
+    modules imported later on first use, the first frame and the menu
+    becoming ready, in ms since the module started loading. Also lists
+    which of the heavier modules were loaded by the first frame.
+    """
+    WATCH = ("urwid", "pyfiglet", "requests", "urllib3", "ssl", "sqlite3", "PIL")
+
+    def __init__(self, started, imported):
+        self.started = started
+        self.events = [("module imports", started, imported)]
+        self.first_frame_modules = None
+
+    @contextlib.contextmanager
+    def timed(self, label):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.events.append((label, start, time.perf_counter()))
+
+    def mark(self, label):
+        now = time.perf_counter()
+        self.events.append((label, now, now))
+
+    def attach(self, screen):
+        """Mark the first frame `screen` draws."""
+        draw_screen = screen.draw_screen
+
+        def first_draw(size, canvas):
+            draw_screen(size, canvas)
+            self.mark("first frame")
+            self.first_frame_modules = [name for name in self.WATCH if name in sys.modules]
+            screen.draw_screen = draw_screen
+
+        screen.draw_screen = first_draw
+
+    def report(self):
+        lines = ["startup profile (ms since the first import):"]
+        for label, start, end in sorted(self.events, key=lambda event: event[1]):
+            took = f"  took {(end - start) * 1000:.1f}" if end > start else ""
+            lines.append(f"  {label:<24}{(start - self.started) * 1000:>8.1f}{took}")
+        if self.first_frame_modules is not None:
+            lines.append(f"  loaded by the first frame: {', '.join(self.first_frame_modules) or '-'}")
+            lines.append("  not yet loaded: " + (", ".join(
+                name for name in self.WATCH if name not in self.first_frame_modules) or "-"))
+        return "\n".join(lines)
+
+
+startup_profile = StartupProfile(IMPORT_START, IMPORT_END)
+
+
+def search_cache_key(query, page=1):
+    """Cache key for a search: case- and whitespace-insensitive query plus page."""
+    return f"search:{' '.join(query.lower().split())}:{page}"
+
+
+def details_cache_key(mal_id):
+    return f"details:{mal_id}"
+
+
+class ResponseCache:
+    """
+    Persistent SQLite cache of decoded Jikan responses.
+    Entries older than `ttl` seconds are still served, flagged as stale,
+    so the caller can render them at once and refresh in the background.
+    At most `max_entries` rows are kept; the least recently used go first.
+    Shared between the main loop and worker threads, hence the lock.
+    """
+    def __init__(self, path=None, ttl=3600, max_entries=1000):
+        if path is None:
+            path = default_cache_path()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " body TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses(accessed_at)")
+
+    def get(self, key):
+        """
+        Return (value, stale) for a cached key, or (None, False) on a miss.
+        A hit refreshes the entry's LRU position.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None, False
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        stale = now - row[1] > self.ttl
+        if stale:
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        return json.loads(row[0]), stale
+
+    def peek(self, key):
+        """Like get(), but neither counted as a hit or miss nor touching the LRU order."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None, False
+        return json.loads(row[0]), time.time() - row[1] > self.ttl
+
+    def put(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, body, fetched_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now)
+            )
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def stats(self):
+        return f"cache: {self.hits} hit  {self.stale_hits} stale  {self.misses} miss"
+
+
+class RateLimiter:
+    """
+    Token-bucket scheduler shared by every thread talking to the API.
+    Each (count, period) limit is a bucket holding the send times of the
+    last `count` requests, so a request is allowed once the oldest of them
+    is `period` seconds old; unlike a refilling bucket this never lets a
+    burst at a window boundary exceed the limit.
+    Blocked callers queue by priority and then arrival order, so an
+    interactive search always goes out before queued background work.
+    Background work also leaves `reserve` tokens of every bucket unused,
+    so a burst of prefetches can't make the next search wait.
+    """
+    def __init__(self, limits=JIKAN_RATE_LIMITS, reserve=1):
+        self._buckets = [(period, collections.deque(maxlen=count)) for count, period in limits]
+        self._reserve = reserve
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._tickets = itertools.count()
+        self._blocked_until = 0.0
+
+    def _delay(self, now, priority):
+        delay = self._blocked_until - now
+        for period, sent in self._buckets:
+            allowed = sent.maxlen
+            if priority > PRIORITY_INTERACTIVE:
+                allowed = max(1, allowed - self._reserve)
+            if len(sent) >= allowed:
+                delay = max(delay, sent[len(sent) - allowed] + period - now)
+        return delay
+
+    def acquire(self, priority=PRIORITY_INTERACTIVE):
+        """Block until a request at `priority` may be sent, and spend a token."""
+        with self._cond:
+            ticket = (priority, next(self._tickets))
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None
+                    if self._waiters[0] == ticket:
+                        wait = self._delay(now, priority)
+                        if wait <= 0:
+                            for _period, sent in self._buckets:
+                                sent.append(now)
+                            return
+                    self._cond.wait(wait)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def back_off(self, seconds):
+        """Hold every request for `seconds`, e.g. after a 429 with Retry-After."""
+        with self._cond:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+
+def retry_after_seconds(resp, default=1.0):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical calls: while one thread is running
+    do(key, ...), other threads asking for the same key wait for and
+    share its result instead of issuing their own request.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func, *args):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+        if not leader:
+            return call.result()
+        try:
+            result = func(*args)
+        except Exception as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class JikanClient:
+    """
+    Shared Jikan API client: one keep-alive requests.Session with a
+    connection pool, every request gated by the RateLimiter.
+    A 429 pauses all requests for the server's Retry-After and retries.
+    Identical requests in flight at the same time share one round trip
+    (callers can coalesce their own work through `inflight`, too).
+    `base_url` can point at a local stand-in server for testing.
+    """
+    def __init__(self, base_url=JIKAN_API_URL, limiter=None, pool_size=4, timeout=10, max_retries=3):
+        self.base_url = base_url.rstrip("/")
+        self.limiter = limiter if limiter is not None else RateLimiter()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.pool_size = pool_size
+        self._session = None
+        self._session_lock = threading.Lock()
+        self.inflight = SingleFlight()
+
+    @property
+    def session(self):
+        """
+        The requests.Session, made on first use: importing requests pulls
+        in urllib3, ssl and charset detection, which the first frame
+        doesn't need.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    with startup_profile.timed("import requests"):
+                        import requests
+                    session = requests.Session()
+                    # Two host pools: the API itself and the image CDN.
+                    adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=self.pool_size)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def _url(self, path):
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def get(self, path, params=None, priority=PRIORITY_INTERACTIVE):
+        """Blocking GET of `path` under the API root; returns the decoded JSON body."""
+        url = self._url(path)
+        key = (url, tuple(sorted((params or {}).items())))
+        return self.inflight.do(key, lambda: self._request(url, params, priority).json())
+
+    def iter_text(self, path, params=None, priority=PRIORITY_INTERACTIVE, chunk_size=16384):
+        """
+        Blocking GET of `path` that yields the body as decoded text chunks
+        while it downloads, for incremental parsing.
+        """
+        resp = self._request(self._url(path), params, priority, stream=True)
+        decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+        with resp:
+            for chunk in resp.iter_content(chunk_size):
+                yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True)
+
+    def download(self, url):
+        """Blocking GET of a raw asset such as a poster image; not rate limited."""
+        resp = self.session.get(url, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.content
+
+    def _request(self, url, params, priority, stream=False):
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(priority)
+            resp = self.session.get(url, params=params, timeout=self.timeout, stream=stream)
+            if resp.status_code == 429 and attempt < self.max_retries:
+                resp.close()
+                self.limiter.back_off(retry_after_seconds(resp))
+                continue
+            resp.raise_for_status()
+            return resp
+
+
+def normalize_title(text):
+    return " ".join(text.casefold().split())
+
+
+def title_trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class AnimeRecord:
+    """
+    One search result, reduced to the fields the result list, detail pane
+    and title index use. Slotted, since a long scroll holds thousands.
+    Cached as a flat list (to_row / from_row) rather than the API's JSON.
+    """
+    __slots__ = ("mal_id", "title", "title_english", "title_japanese", "synonyms", "image_url")
+
+    def __init__(self, mal_id, title, title_english=None, title_japanese=None, synonyms=(), image_url=None):
+        self.mal_id = mal_id
+        self.title = title or "Unknown Title"
+        self.title_english = title_english
+        self.title_japanese = title_japanese
+        self.synonyms = tuple(synonyms)
+        self.image_url = image_url
+
+    @classmethod
+    def from_json(cls, anime):
+        synonyms = list(anime.get("title_synonyms") or ())
+        synonyms.extend(entry.get("title") for entry in anime.get("titles") or ())
+        return cls(
+            anime.get("mal_id"),
+            anime.get("title"),
+            anime.get("title_english"),
+            anime.get("title_japanese"),
+            [name for name in synonyms if name],
+            anime_image_url(anime),
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        if isinstance(row, dict):
+            # Entry cached as raw API JSON by an older version.
+            return cls.from_json(row)
+        return cls(*row)
+
+    def to_row(self):
+        return [self.mal_id, self.title, self.title_english, self.title_japanese,
+                list(self.synonyms), self.image_url]
+
+    def names(self):
+        """Every name the anime is known by: main, English, Japanese and synonyms."""
+        names = (self.title, self.title_english, self.title_japanese) + self.synonyms
+        return [name for name in dict.fromkeys(names) if name]
+
+
+class JikanPageParser:
+    """
+    Incremental parser for a Jikan list response, {"pagination": ..., "data": [...]}.
+    feed() it text as it arrives; it returns the items of the "data" array
+    that are complete so far, so rows can be shown before the body ends.
+    Other top-level keys are decoded whole into `fields`.
+    Only the unparsed tail of the body is kept in memory.
+    """
+    _decoder = json.JSONDecoder()
+    _whitespace = " \t\n\r"
+
+    def __init__(self):
+        self.fields = {}
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"
+        self._key = None
+
+    @property
+    def done(self):
+        return self._state == "done"
+
+    def _skip(self, extra=""):
+        buf, pos, skip = self._buf, self._pos, self._whitespace + extra
+        while pos < len(buf) and buf[pos] in skip:
+            pos += 1
+        self._pos = pos
+        return buf[pos] if pos < len(buf) else None
+
+    def _decode(self):
+        """
+        Decode the value at the cursor, or return a sentinel if the buffer
+        ends inside it. A value must be followed by another non-blank
+        character, so a number split across chunks isn't cut short.
+        """
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except ValueError:
+            return self
+        rest = end
+        while rest < len(self._buf) and self._buf[rest] in self._whitespace:
+            rest += 1
+        if rest >= len(self._buf):
+            return self
+        self._pos = end
+        return value
+
+    def feed(self, text):
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        items = []
+        while True:
+            if self._state == "start":
+                char = self._skip()
+                if char is None:
+                    break
+                if char != "{":
+                    raise ValueError("expected a JSON object")
+                self._pos += 1
+                self._state = "key"
+            elif self._state == "key":
+                char = self._skip(",")
+                if char is None:
+                    break
+                if char == "}":
+                    self._pos += 1
+                    self._state = "done"
+                    break
+                key = self._decode()
+                if key is self:
+                    break
+                if self._skip() != ":":
+                    raise ValueError("expected ':' after object key")
+                self._pos += 1
+                self._key = key
+                self._state = "value"
+            elif self._state == "value":
+                char = self._skip()
+                if char is None:
+                    break
+                if self._key == "data" and char == "[":
+                    self._pos += 1
+                    self._state = "items"
+                    continue
+                value = self._decode()
+                if value is self:
+                    break
+                self.fields[self._key] = value
+                self._state = "key"
+            elif self._state == "items":
+                char = self._skip(",")
+                if char is None:
+                    break
+                if char == "]":
+                    self._pos += 1
+                    self._state = "key"
+                    continue
+                item = self._decode()
+                if item is self:
+                    break
+                items.append(item)
+            else:
+                break
+        return items
+
+
+class TitleIndex:
+    """
+    In-memory trigram index over every title the app has received, so a
+    search can show local matches the instant ENTER is pressed.
+    Entries are persisted in the cache database and reloaded at startup.
+    The in-memory index is only touched on the main loop; load() and
+    save() do the SQLite work and run on BackgroundRunner workers.
+    """
+    def __init__(self, path=None):
+        self._path = path if path is not None else default_cache_path()
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._entries = {}
+        self._grams = collections.defaultdict(set)
+
+    def _connect(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS titles ("
+                " mal_id INTEGER PRIMARY KEY,"
+                " title TEXT NOT NULL,"
+                " names TEXT NOT NULL)"
+            )
+        return self._db
+
+    @staticmethod
+    def _insert(entries, grams, mal_id, title, names):
+        keys = tuple(normalize_title(name) for name in names)
+        entries[mal_id] = (title, keys)
+        for key in keys:
+            for gram in title_trigrams(key):
+                grams[gram].add(mal_id)
+
+    def load(self):
+        """Worker thread: build an index from the database, for finish_load()."""
+        entries = {}
+        grams = collections.defaultdict(set)
+        with self._db_lock:
+            rows = self._connect().execute("SELECT mal_id, title, names FROM titles").fetchall()
+        for mal_id, title, names in rows:
+            self._insert(entries, grams, mal_id, title, json.loads(names))
+        return entries, grams
+
+    def finish_load(self, future):
+        """Main loop: swap in the loaded index, keeping titles added meanwhile."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        entries, grams = future.result()
+        for mal_id, (title, keys) in self._entries.items():
+            if mal_id not in entries:
+                self._insert(entries, grams, mal_id, title, keys)
+        self._entries, self._grams = entries, grams
+
+    def add(self, records):
+        """
+        Main loop: index newly received records.
+        Returns the (mal_id, title, names) rows that still need save().
+        """
+        rows = []
+        for record in records:
+            mal_id = record.mal_id
+            names = record.names()
+            if mal_id is None:
+                continue
+            if mal_id in self._entries and len(self._entries[mal_id][1]) >= len(names):
+                continue
+            self._insert(self._entries, self._grams, mal_id, record.title, names)
+            rows.append((mal_id, record.title, names))
+        return rows
+
+    def save(self, rows):
+        with self._db_lock:
+            self._connect().executemany(
+                "INSERT OR REPLACE INTO titles (mal_id, title, names) VALUES (?, ?, ?)",
+                [(mal_id, title, json.dumps(names)) for mal_id, title, names in rows]
+            )
+
+    def search(self, query, limit=25):
+        """
+        Titles containing `query` (any of their names), prefix matches first.
+        Returns minimal AnimeRecords (id and title) for PagedResultWalker.
+        """
+        query = normalize_title(query)
+        if len(query) < 3:
+            candidates = self._entries.keys()
+        else:
+            postings = sorted((self._grams.get(gram, ()) for gram in title_trigrams(query)), key=len)
+            if not postings[0]:
+                return []
+            candidates = set(postings[0]).intersection(*postings[1:])
+
+        matches = []
+        for mal_id in candidates:
+            title, keys = self._entries[mal_id]
+            best = None
+            for key in keys:
+                position = key.find(query)
+                if position != -1 and (best is None or position < best):
+                    best = position
+            if best is not None:
+                matches.append((best != 0, len(title), title, mal_id))
+        return [
+            AnimeRecord(mal_id, title)
+            for _, _, title, mal_id in heapq.nsmallest(limit, matches)
+        ]
+
+
+def fetch_anime(client, query, page=1, cache=None, priority=PRIORITY_INTERACTIVE, on_records=None):
+    """
+    Blocking Jikan search for one page of results. Runs on a BackgroundRunner
+    worker thread, never on the urwid main loop. The body is parsed as it
+    downloads; `on_records`, if given, is called from the worker with each
+    batch of AnimeRecords as soon as they are complete.
+    Returns {"data": [AnimeRecord, ...], "has_next_page": bool} and stores
+    it in `cache` if given. Identical searches in flight share one request
+    (only the first caller's `on_records` sees the batches).
+    """
+    return client.inflight.do(
+        ("search", query, page),
+        _fetch_anime_page, client, query, page, cache, priority, on_records
+    )
+
+
+def _fetch_anime_page(client, query, page, cache, priority, on_records):
+    parser = JikanPageParser()
+    records = []
+    for text in client.iter_text("anime", params={"q": query, "page": page}, priority=priority):
+        batch = [AnimeRecord.from_json(item) for item in parser.feed(text)]
+        if batch:
+            records.extend(batch)
+            if on_records is not None:
+                on_records(batch)
+    if not parser.done:
+        raise ValueError("truncated response from the Jikan API")
+
+    result = {
+        "data": records,
+        "has_next_page": bool(parser.fields.get("pagination", {}).get("has_next_page")),
+    }
+    if cache is not None:
+        cache.put(search_cache_key(query, page), {
+            "data": [record.to_row() for record in records],
+            "has_next_page": result["has_next_page"],
+        })
+    return result
+
+
+def cached_page(cache, query, page=1):
+    """A search page from `cache` as (result, stale), records rebuilt as AnimeRecords."""
+    value, stale = cache.get(search_cache_key(query, page))
+    if value is None:
+        return None, False
+    return {
+        "data": [AnimeRecord.from_row(row) for row in value["data"]],
+        "has_next_page": value["has_next_page"],
+    }, stale
+
+
+def load_anime_page(client, query, page=1, cache=None, priority=PRIORITY_INTERACTIVE, on_records=None,
+                    refresh=False):
+    """
+    Blocking: (result, stale) for a search page, from `cache` when it has
+    it, else fetched with fetch_anime(). Stale cached pages are returned as
+    they are for the caller to refresh; `refresh` skips the cache.
+    """
+    if cache is not None and not refresh:
+        result, stale = cached_page(cache, query, page)
+        if result is not None:
+            return result, stale
+    return fetch_anime(client, query, page, cache, priority, on_records), False
+
+
+def fetch_anime_details(client, mal_id, cache=None, priority=PRIORITY_BACKGROUND):
+    """
+    Blocking fetch of /anime/{id}/full, trimmed to the fields the detail
+    pane shows. Stores the result in `cache` if given.
+    """
+    anime = client.get(f"anime/{mal_id}/full", priority=priority).get("data", {})
+    details = {
+        "mal_id": mal_id,
+        "title": anime.get("title"),
+        "title_english": anime.get("title_english"),
+        "type": anime.get("type"),
+        "year": anime.get("year"),
+        "status": anime.get("status"),
+        "score": anime.get("score"),
+        "episodes": anime.get("episodes"),
+        "genres": [genre.get("name") for genre in anime.get("genres") or ()],
+        "synopsis": anime.get("synopsis"),
+        "image_url": anime_image_url(anime),
+    }
+    if cache is not None:
+        cache.put(details_cache_key(mal_id), details)
+    return details
+
+
+def load_anime_details(client, mal_id, cache=None, priority=PRIORITY_BACKGROUND, probe=False, refresh=False):
+    """
+    Blocking: (details, stale) for `mal_id`, from `cache` when it has
+    them, else fetched. Stale cached details are returned as they are for
+    the caller to refresh. A `probe` (prefetch) doesn't count towards the
+    cache's hit and miss stats; `refresh` skips the cache.
+    """
+    if cache is not None and not refresh:
+        key = details_cache_key(mal_id)
+        details, stale = cache.peek(key) if probe else cache.get(key)
+        if details is not None:
+            return details, stale
+    return fetch_anime_details(client, mal_id, cache, priority), False
+
+
+def anime_image_url(anime):
+    return (anime.get("images") or {}).get("jpg", {}).get("image_url") or anime.get("image_url")
+
+
+def xterm256(r, g, b):
+    """Nearest xterm 256-color index: the 6x6x6 cube or the 24-step gray ramp."""
+    def level(v):
+        return min(range(6), key=lambda i: abs(XTERM_CUBE_LEVELS[i] - v))
+
+    ri, gi, bi = level(r), level(g), level(b)
+    cube = (XTERM_CUBE_LEVELS[ri], XTERM_CUBE_LEVELS[gi], XTERM_CUBE_LEVELS[bi])
+    gray_step = min(23, max(0, round(((r + g + b) / 3 - 8) / 10)))
+    gray = 8 + gray_step * 10
+
+    def distance(c):
+        return (c[0] - r) ** 2 + (c[1] - g) ** 2 + (c[2] - b) ** 2
+
+    if distance((gray, gray, gray)) < distance(cube):
+        return 232 + gray_step
+    return 16 + 36 * ri + 6 * gi + bi
+
+
+def render_half_blocks(image_bytes, size):
+    """
+    Decode an image and downsample it to a grid of half-block cells.
+    Returns rows of [fg, bg] xterm color pairs: fg paints the upper pixel
+    and bg the lower one of each "▀" cell.
+    """
+    from PIL import Image
+
+    cols, rows = size
+    image = Image.open(BytesIO(image_bytes)).convert("RGB")
+    image = image.resize((cols, rows * 2), Image.LANCZOS)
+    pixels = image.load()
+    return [
+        [[xterm256(*pixels[x, 2 * y]), xterm256(*pixels[x, 2 * y + 1])] for x in range(cols)]
+        for y in range(rows)
+    ]
+
+
+def fetch_thumbnail(client, url, size, cache=None):
+    """
+    Blocking: download and render a poster thumbnail. Rendered grids are
+    cached by URL and size, so a poster is only ever decoded once.
+    """
+    key = f"thumb:{size[0]}x{size[1]}:{url}"
+    if cache is not None:
+        grid, _stale = cache.get(key)
+        if grid is not None:
+            return grid
+    grid = render_half_blocks(client.download(url), size)
+    if cache is not None:
+        cache.put(key, grid)
+    return grid
+
+
+def thumbnail_markup(grid):
+    """Text markup for a half-block grid, merging runs of equal colors."""
+    markup = []
+    attrs = {}
+    for y, row in enumerate(grid):
+        if y:
+            markup.append("\n")
+        run_colors, run_length = None, 0
+        for fg, bg in row:
+            if (fg, bg) != run_colors and run_length:
+                markup.append((attrs[run_colors], "▀" * run_length))
+                run_length = 0
+            run_colors = (fg, bg)
+            if run_colors not in attrs:
+                attrs[run_colors] = urwid.AttrSpec(f"h{fg}", f"h{bg}", colors=256)
+            run_length += 1
+        if run_length:
+            markup.append((attrs[run_colors], "▀" * run_length))
+    return markup
+
+
+class BackgroundRunner:
+    """
+    Small pool of daemon worker threads for blocking work (HTTP, disk).
+    Results are handed back to the urwid main loop through a watched pipe,
+    so every callback runs on the UI thread and may touch widgets freely.
+    Daemon threads mean quitting never waits on a slow request.
+    Queued jobs start by priority and then arrival order, and background
+    jobs never take the last `reserve` workers, so a search isn't stuck
+    behind prefetches parked in RateLimiter.acquire().
+    """
+    def __init__(self, loop, workers=4, reserve=1):
+        self._jobs = []
+        self._tickets = itertools.count()
+        self._cond = threading.Condition()
+        self._background = 0
+        self._background_limit = max(1, workers - reserve)
+        self._done = queue.SimpleQueue()
+        self._pipe_fd = loop.watch_pipe(self._drain)
+        for i in range(workers):
+            worker = threading.Thread(target=self._work, name=f"jikan-worker-{i}", daemon=True)
+            worker.start()
+
+    def submit(self, func, callback, *args, priority=PRIORITY_INTERACTIVE):
+        """
+        Run func(*args) on a worker, then callback(future) on the main loop.
+        The returned Future may be cancelled while it is still queued.
+        """
+        future = Future()
+        with self._cond:
+            heapq.heappush(self._jobs, (priority, next(self._tickets), future, func, args, callback))
+            self._cond.notify()
+        return future
+
+    def call_soon(self, callback, *args):
+        """Thread-safe: schedule callback(*args) on the main loop."""
+        self._done.put((callback, args))
+        os.write(self._pipe_fd, b"\0")
+
+    def _next_job(self):
+        with self._cond:
+            while True:
+                if self._jobs:
+                    priority = self._jobs[0][0]
+                    if priority == PRIORITY_INTERACTIVE:
+                        return heapq.heappop(self._jobs)
+                    if self._background < self._background_limit:
+                        self._background += 1
+                        return heapq.heappop(self._jobs)
+                self._cond.wait()
+
+    def _work(self):
+        while True:
+            priority, _, future, func, args, callback = self._next_job()
+            try:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(func(*args))
+                except Exception as e:
+                    future.set_exception(e)
+                self.call_soon(callback, future)
+            finally:
+                if priority > PRIORITY_INTERACTIVE:
+                    with self._cond:
+                        self._background -= 1
+                        self._cond.notify()
+
+    def _drain(self, data):
+        while True:
+            try:
+                callback, args = self._done.get_nowait()
+            except queue.Empty:
+                return True
+            callback(*args)
+
 
 class LeftLabelLineBox(urwid.WidgetWrap):
     """
@@ -89,19 +1019,368 @@ class LeftLabelLineBox(urwid.WidgetWrap):
         ])
 
 
+# xterm's basic 16 colours, in urwid's colour order, for 16-colour output
+BASIC_COLORS = (
+    ("black", (0, 0, 0)), ("dark red", (205, 0, 0)),
+    ("dark green", (0, 205, 0)), ("brown", (205, 205, 0)),
+    ("dark blue", (0, 0, 238)), ("dark magenta", (205, 0, 205)),
+    ("dark cyan", (0, 205, 205)), ("light gray", (229, 229, 229)),
+    ("dark gray", (127, 127, 127)), ("light red", (255, 0, 0)),
+    ("light green", (0, 255, 0)), ("yellow", (255, 255, 0)),
+    ("light blue", (92, 92, 255)), ("light magenta", (255, 0, 255)),
+    ("light cyan", (0, 255, 255)), ("white", (255, 255, 255)),
+)
+UNKNOWN = object()
+
+
+def nearest_basic_color(rgb):
+    if rgb[0] is None:
+        return "default"
+    return min(BASIC_COLORS, key=lambda entry: sum((a - b) ** 2 for a, b in zip(entry[1], rgb)))[0]
+
+
+class LowBandwidthScreen(urwid.display.raw.Screen):
+    """
+    Raw terminal screen that counts the bytes written for each frame and,
+    when `low_bandwidth` is set, only repaints the cells that changed.
+
+    urwid skips rows that match the previous frame but rewrites a changed
+    row in full. Here a changed row is compared cell by cell with what is
+    on the terminal and only the differing spans are sent, each behind the
+    shortest cursor move that reaches it, with attribute sequences written
+    only when the attribute actually changes. At 16 colours, 256-colour
+    and true-colour attributes (thumbnails) use the nearest basic colour.
+    """
+    SPAN_GAP = 6  # unchanged cells cheaper to rewrite than to jump over
+
+    def __init__(self, low_bandwidth=False, **kwargs):
+        super().__init__(**kwargs)
+        self.low_bandwidth = low_bandwidth
+        self.frames = 0
+        self.frame_bytes = 0
+        self.bytes_written = 0
+        self._basic_attrs = {}
+        self._forget()
+
+    def _forget(self):
+        """Stop trusting what we last drew; the next frame repaints everything."""
+        self._canvas = None
+        self._rows = []
+        self._cells = []
+        self._cursor = None
+        self._attr = UNKNOWN
+
+    def _start(self, *args, **kwargs):
+        super()._start(*args, **kwargs)
+        self._forget()
+
+    def _stop(self):
+        if self.low_bandwidth:
+            self.write("\x1b[?7h")  # autowrap back on
+        super()._stop()
+
+    def clear(self):
+        super().clear()
+        self._forget()
+
+    def write(self, data):
+        self.bytes_written += len(data.encode("utf-8", "replace"))
+        super().write(data)
+
+    def stats(self):
+        average = self.bytes_written // self.frames if self.frames else 0
+        mode = "low-bandwidth" if self.low_bandwidth else "full-row"
+        return (f"{mode} output: last frame {self.frame_bytes} B  "
+                f"avg {average} B over {self.frames} frames")
+
+    def draw_screen(self, size, canvas):
+        before = self.bytes_written
+        if self.low_bandwidth and self._rows_used is None and urwid.util.get_encoding() == "utf-8":
+            self._draw_changes(size, canvas)
+        else:
+            super().draw_screen(size, canvas)
+            self._forget()
+        if self.bytes_written != before:
+            self.frames += 1
+            self.frame_bytes = self.bytes_written - before
+
+    def _attrspec_to_escape(self, a):
+        if self.colors <= 16 and (a.foreground_high or a.foreground_true
+                                  or a.background_high or a.background_true):
+            basic = self._basic_attrs.get(a)
+            if basic is None:
+                rgb = a.get_rgb_values()
+                settings = [name for name in ("bold", "italics", "underline", "blink", "standout", "strikethrough")
+                            if getattr(a, name, False)]
+                foreground = ",".join([nearest_basic_color(rgb[:3])] + settings)
+                basic = self._basic_attrs[a] = urwid.AttrSpec(foreground, nearest_basic_color(rgb[3:]), 16)
+            a = basic
+        return super()._attrspec_to_escape(a)
+
+    def _draw_changes(self, size, canvas):
+        if not self._started:
+            raise RuntimeError
+        if self._resized or canvas is self._canvas:
+            return
+        maxcol, maxrow = size
+        if maxrow != canvas.rows():
+            raise ValueError(maxrow)
+
+        output = []
+        if len(self._rows) != maxrow or (self._cells and len(self._cells[0]) != maxcol):
+            self._forget()
+            # Nothing below may wrap or scroll, even writing the last column
+            output.append("\x1b[?7l")
+        rows = list(canvas.content())
+        cells = self._cells or [None] * maxrow
+        for y, row in enumerate(rows):
+            if self._rows and self._rows[y] == row:
+                continue
+            old, new = cells[y], self._row_cells(row)
+            for start, end in self._changed_spans(old, new):
+                self._move_to(output, start, y)
+                blank = self._blank_tail(new, start) if end == maxcol else 0
+                for attr, text in new[start:end - blank]:
+                    if attr != self._attr:
+                        output.append(self._attr_to_escape(attr))
+                        self._attr = attr
+                    output.append(text)
+                end -= blank
+                if blank:
+                    if new[-1][0] != self._attr:
+                        output.append(self._attr_to_escape(new[-1][0]))
+                        self._attr = new[-1][0]
+                    output.append("\x1b[K")  # erase to the end of the row
+                # The cursor stays put after writing the last column
+                self._cursor = (end, y) if end < maxcol else None
+            cells[y] = new
+        if canvas.cursor is not None:
+            self._move_to(output, *canvas.cursor)
+
+        if output:
+            try:
+                self.write("".join(output))
+                self.flush()
+            except OSError as e:
+                # ignore interrupted syscall
+                if e.args[0] != errno.EINTR:
+                    raise
+        self._canvas = canvas
+        self._rows = rows
+        self._cells = cells
+
+    @staticmethod
+    def _row_cells(row):
+        """One (attr, text) per screen column; wide characters are followed by (attr, "")."""
+        cells = []
+        for attr, _charset, run in row:
+            for char in run.decode("utf-8", "replace"):
+                width = urwid.str_util.get_char_width(char)
+                if width == 0 and cells:
+                    cells[-1] = (cells[-1][0], cells[-1][1] + char)
+                    continue
+                if char < " " or "\x7f" <= char < "\xa0":
+                    char = "?"
+                cells.append((attr, char))
+                if width == 2:
+                    cells.append((attr, ""))
+        return cells
+
+    def _blank_tail(self, cells, start):
+        """How many trailing blanks can be erased instead of written."""
+        attr = cells[-1][0]
+        spec = self._pal_attrspec.get(attr, attr)
+        if not self.back_color_erase or (isinstance(spec, urwid.AttrSpec) and (spec.standout or spec.underline)):
+            return 0
+        blank = 0
+        while blank < len(cells) - start and cells[-1 - blank] == (attr, " "):
+            blank += 1
+        return blank if blank > 3 else 0
+
+    def _changed_spans(self, old, new):
+        if old is None or len(old) != len(new):
+            yield 0, len(new)
+            return
+        start = end = None
+        for x, (before, after) in enumerate(zip(old, new)):
+            if before == after:
+                continue
+            if start is None:
+                start = x
+            elif x - end > self.SPAN_GAP:
+                yield self._whole_chars(new, start, end)
+                start = x
+            end = x + 1
+        if start is not None:
+            yield self._whole_chars(new, start, end)
+
+    @staticmethod
+    def _whole_chars(cells, start, end):
+        # Never start or stop a span in the middle of a wide character
+        if start and cells[start][1] == "":
+            start -= 1
+        if end < len(cells) and cells[end][1] == "":
+            end += 1
+        return start, end
+
+    def _move_to(self, output, x, y):
+        if self._cursor == (x, y):
+            return
+        move = f"\x1b[{y + 1};{x + 1}H" if x else f"\x1b[{y + 1}H"
+        if self._cursor is not None and self._cursor[1] == y and self._cursor[0] < x:
+            forward = f"\x1b[{x - self._cursor[0]}C"
+            if len(forward) < len(move):
+                move = forward
+        output.append(move)
+        self._cursor = (x, y)
+
+
+class ScheduledMainLoop(urwid.MainLoop):
+    """
+    MainLoop that batches work per burst of input and caps the frame rate.
+
+    urwid hands every key that is already waiting to the widgets before it
+    goes idle and redraws. defer() queues a callback to run once, just
+    before the next frame, so handlers that fire per key (a paste into the
+    search box) only leave work behind and it runs once for the whole
+    burst. Consecutive mouse drags in one batch collapse to the last
+    position, and frames are drawn at most `fps` times a second.
+    """
+    def __init__(self, *args, fps=60, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.frame_interval = 1 / fps
+        self._deferred = {}
+        self._last_frame = 0
+        self._frame_alarm = None
+
+    def defer(self, callback, *args):
+        """Run callback(*args) once before the next frame; a repeat call replaces the arguments."""
+        self._deferred[callback] = args
+
+    def input_filter(self, keys, raw):
+        keys = super().input_filter(keys, raw)
+        batched = []
+        for key in keys:
+            if (batched and urwid.util.is_mouse_event(key) and key[0] == "mouse drag"
+                    and urwid.util.is_mouse_event(batched[-1]) and batched[-1][:2] == key[:2]):
+                batched[-1] = key
+            else:
+                batched.append(key)
+        return batched
+
+    def process_input(self, keys):
+        # A burst of printable keys for the focused Edit (a paste) goes in
+        # as one insert: typing it key by key re-measures the whole widget
+        # tree per character, which is quadratic in the pasted length.
+        handled = False
+        typed = []
+        for key in list(keys) + [None]:
+            if isinstance(key, str) and len(key) == 1 and key.isprintable():
+                typed.append(key)
+                continue
+            if typed:
+                handled = self._type(typed) or handled
+                typed = []
+            if key is not None:
+                handled = super().process_input([key]) or handled
+        return handled
+
+    def _type(self, chars):
+        edit = self._focused_edit()
+        if len(chars) > 1 and edit is not None and all(edit.valid_char(char) for char in chars):
+            edit.insert_text("".join(chars))
+            return True
+        return super().process_input(chars)
+
+    def _focused_edit(self):
+        widget = self._topmost_widget
+        while widget is not None:
+            base = widget.base_widget
+            if isinstance(base, urwid.Edit):
+                return base
+            widget = getattr(base, "focus", None)
+            if widget is None:
+                widget = getattr(base, "_wrapped_widget", None)
+        return None
+
+    def entering_idle(self):
+        if self._frame_alarm is not None or not self.screen.started:
+            return
+        wait = self._last_frame + self.frame_interval - time.monotonic()
+        if wait > 0:
+            # Too soon for another frame; going idle after the alarm draws it
+            self._frame_alarm = self.set_alarm_in(wait, self._frame_due)
+            return
+        while self._deferred:
+            deferred, self._deferred = self._deferred, {}
+            for callback, args in deferred.items():
+                callback(*args)
+        self._last_frame = time.monotonic()
+        self.draw_screen()
+
+    def _frame_due(self, loop, user_data):
+        self._frame_alarm = None
+
+
+class CursorController:
+    """
+    Owns the terminal cursor's visibility for a raw-display screen.
+
+    urwid hides the cursor at the start of every frame and shows it again
+    whenever the canvas has a cursor. Instead of widgets patching
+    urwid.escape from render(), the screen's frames are filtered here: the
+    cursor is visible exactly when the focused widget placed one (the
+    search box), and show/hide sequences are only written when that
+    changes, so renders stay side-effect free and cacheable.
+    """
+    def __init__(self):
+        self.visible = None  # unknown until the first frame
+        self._drawing = False
+        self._wants_cursor = False
+
+    def attach(self, screen):
+        draw_screen = screen.draw_screen
+        write = screen.write
+
+        def controlled_draw_screen(size, canvas):
+            self._wants_cursor = canvas.cursor is not None
+            self._drawing = True
+            try:
+                draw_screen(size, canvas)
+            finally:
+                self._drawing = False
+
+        def controlled_write(data):
+            write(self.filter(data) if self._drawing else self.track(data))
+
+        screen.draw_screen = controlled_draw_screen
+        screen.write = controlled_write
+        return self
+
+    def filter(self, frame):
+        frame = frame.replace(HIDE_CURSOR, "").replace(SHOW_CURSOR, "")
+        if self._wants_cursor != self.visible:
+            self.visible = self._wants_cursor
+            # Showing goes last, after urwid has moved the cursor into place
+            frame = frame + SHOW_CURSOR if self.visible else HIDE_CURSOR + frame
+        return frame
+
+    def track(self, data):
+        # Writes outside a frame (start/stop, suspend) may change the cursor
+        if SHOW_CURSOR in data or HIDE_CURSOR in data:
+            self.visible = data.rfind(SHOW_CURSOR) > data.rfind(HIDE_CURSOR)
+        return data
+
+
 class CursorAwareEdit(urwid.Edit):
     """
-    Edit widget that explicitly shows the cursor when focused
-    and triggers search on ENTER.
+    Edit widget that triggers search on ENTER, or after a pause in
+    typing when the controller is in live-search mode.
     """
     def __init__(self, controller, caption="", edit_text="", allow_tab=False):
         super().__init__(caption=caption, edit_text=edit_text, allow_tab=allow_tab)
         self.controller = controller
-
-    def render(self, size, focus=False):
-        if focus:
-            esc.SHOW_CURSOR = SHOW_CURSOR
-        return super().render(size, focus)
+        urwid.connect_signal(self, "postchange", self.text_changed)
 
     def keypress(self, size, key):
         # If user presses ENTER, perform the search
@@ -110,51 +1389,79 @@ class CursorAwareEdit(urwid.Edit):
             return
         return super().keypress(size, key)
 
+    def text_changed(self, edit, old_text):
+        # Typed keys and pasted bursts both land here; one search per burst
+        if self.controller.live_search:
+            self.controller.loop.defer(self.controller.schedule_live_search, self.edit_text)
+
 
-class MenuButton(urwid.Button):
+class MenuButton(urwid.Widget):
     """
-    Custom button class that supports plain string or (attr, string) caption.
-    This avoids type errors by storing and rendering styled text fragments.
+    One-line menu row that supports plain string or (attr, string) caption,
+    drawn as "-> caption" when focused and "   caption" otherwise.
+
+    Rows are flat widgets rather than a Button/AttrMap/Padding/SelectableIcon
+    stack, and the focused and unfocused canvases are built once per width
+    and reused until bind() gives the row a new caption. Moving the focus
+    through a screen of rows therefore only swaps cached canvases.
     """
+    __slots__ = ("_style", "_text", "_canvases", "item")
+
+    _selectable = True
+    _sizing = frozenset([urwid.FLOW])
+    signals = ["click"]
+
+    _prefix_unfocused = "   "
+    _prefix_focused = "-> "
+
     def __init__(self, caption, on_press=None, user_data=None):
-        super().__init__("", on_press=on_press, user_data=user_data)
+        super().__init__()
+        self._canvases = {}
+        self.bind(caption)
+        if on_press:
+            urwid.connect_signal(self, "click", on_press, user_data)
+
+    def rows(self, size, focus=False):
+        return 1
+
+    def render(self, size, focus=False):
+        canvas = self._canvases.get((size, focus))
+        if canvas is None:
+            prefix = self._prefix_focused if focus else self._prefix_unfocused
+            label = urwid.Text(
+                [(self._style, prefix), (self._style, self._text)],
+                wrap="ellipsis"  # clip long titles so every row stays one line tall
+            )
+            canvas = urwid.CompositeCanvas(label.render(size))
+            canvas.fill_attr_apply({None: "menu-focus" if focus else "menu-normal"})
+            self._canvases[(size, focus)] = canvas
+        return canvas
+
+    def keypress(self, size, key):
+        if self._command_map[key] != urwid.ACTIVATE:
+            return key
+        self._emit("click")
+        return None
 
-        self._prefix_unfocused = "   "
-        self._prefix_focused = "-> "
+    def mouse_event(self, size, event, button, col, row, focus):
+        if button != 1 or not urwid.util.is_mouse_press(event):
+            return False
+        self._emit("click")
+        return True
 
+    def bind(self, caption, item=None):
+        """
+        Point the button at a new caption and the item it stands for, so a
+        VirtualListWalker can recycle it for another row.
+        """
         # Decide how to store style and text
         if isinstance(caption, tuple) and len(caption) == 2:
             self._style, self._text = caption
         else:
             self._style, self._text = "menu-normal", str(caption)
-
-        label_text = [
-            (self._style, self._prefix_unfocused),
-            (self._style, self._text)
-        ]
-        self._label = urwid.SelectableIcon(label_text, cursor_position=-1)
-        self._w = urwid.AttrMap(
-            urwid.Padding(self._label, align="left", width=("relative", 100)),
-            "menu-normal",
-            "menu-focus"
-        )
-
-    def render(self, size, focus=False):
-        # Hide the cursor in the results box, but highlight with arrow if focused
-        if focus:
-            esc.SHOW_CURSOR = HIDE_CURSOR
-            label_text = [
-                (self._style, self._prefix_focused),
-                (self._style, self._text)
-            ]
-        else:
-            label_text = [
-                (self._style, self._prefix_unfocused),
-                (self._style, self._text)
-            ]
-        self._label.set_text(label_text)
-        self._label.cursor_position = -1
-        return super().render(size, focus)
+        self.item = item
+        self._canvases.clear()
+        self._invalidate()
 
     def get_caption(self):
         return self._text
@@ -162,15 +1469,9 @@ class MenuButton(urwid.Button):
 
 class NonTabSearchPile(urwid.Pile):
     """
-    Custom Pile that manages cursor visibility based on which widget is focused.
-    Index 0 is the search input, so we show the cursor there. Otherwise, we hide it.
+    Custom Pile that keeps tab from moving focus out of the search input.
+    The cursor shows only while the input is focused; see CursorController.
     """
-    def render(self, size, focus=False):
-        if self.focus_position == 0:
-            esc.SHOW_CURSOR = SHOW_CURSOR
-        else:
-            esc.SHOW_CURSOR = HIDE_CURSOR
-        return super().render(size, focus)
 
     def keypress(self, size, key):
         if key == "tab":
@@ -197,19 +1498,218 @@ class MouseAwarePile(urwid.Pile):
         return super().mouse_event(size, event, button, col, row, focus)
 
 
-class FocusReportingListBox(urwid.ListBox):
+class VirtualListWalker(urwid.ListWalker):
+    """
+    List walker over a plain sequence of items that only keeps row widgets
+    for positions within `margin` of the focus. Rows that drift out of that
+    window go back to a pool and are rebound to other items as the view
+    scrolls, so a list of any length costs a bounded number of widgets.
+    make_row() builds an empty row and bind_row(row, item) fills it in.
+    Every row is `row_height` lines tall; see VirtualListBox.
+    """
+    def __init__(self, items, make_row, bind_row, row_height=1, margin=200):
+        self.items = items
+        self.focus = 0
+        self.row_height = row_height
+        self._make_row = make_row
+        self._bind_row = bind_row
+        self._margin = margin
+        self._rows = {}
+        self._pool = []
+
+    def set_items(self, items, focus=0):
+        """Show a new sequence of items; every row is recycled."""
+        self.items = items
+        self._pool.extend(self._rows.values())
+        self._rows.clear()
+        self.focus = focus
+        self._modified()
+
+    def _trim(self):
+        low = self.focus - self._margin
+        high = self.focus + self._margin
+        for position in [position for position in self._rows if not low <= position <= high]:
+            self._pool.append(self._rows.pop(position))
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, position):
+        row = self._rows.get(position)
+        if row is None:
+            if position < 0:
+                raise IndexError(position)
+            item = self.items[position]
+            if len(self._rows) > 3 * self._margin:
+                self._trim()
+            row = self._pool.pop() if self._pool else self._make_row()
+            self._bind_row(row, item)
+            self._rows[position] = row
+        return row
+
+    def set_focus(self, position):
+        self.focus = position
+        self._modified()
+
+    def next_position(self, position):
+        if position + 1 >= len(self.items):
+            raise IndexError(position)
+        return position + 1
+
+    def prev_position(self, position):
+        if position <= 0:
+            raise IndexError(position)
+        return position - 1
+
+    def positions(self, reverse=False):
+        if reverse:
+            return range(len(self.items) - 1, -1, -1)
+        return range(len(self.items))
+
+
+class VirtualListBox(urwid.ListBox):
+    """
+    ListBox over a VirtualListWalker. Since every row is the same height,
+    the scrollbar's length and position come from index arithmetic instead
+    of measuring every row, so they stay O(1) however long the list is.
+    """
+    def require_relative_scroll(self, size, focus=False):
+        return False
+
+    def rows_max(self, size=None, focus=False):
+        return len(self.body) * self.body.row_height
+
+    def get_scrollpos(self, size=None, focus=False):
+        if not self.body:
+            return 0
+        if size is not None:
+            self._rendered_size = size
+        middle, _top, _bottom = self.calculate_visible(self._rendered_size, focus)
+        if middle is None:
+            return 0
+        # middle.offset is the focus row's distance from the top of the view
+        # (negative when its first lines are scrolled off).
+        return self.body.focus * self.body.row_height - middle.offset
+
+
+class PagedResultWalker(VirtualListWalker):
+    """
+    Virtual list walker over search results that grows one API page at a
+    time. Records already seen (by mal_id) on an earlier page are skipped,
+    since Jikan pages can overlap while the index shifts.
+    """
+    def __init__(self, make_row, bind_row, row_height=1):
+        super().__init__([], make_row, bind_row, row_height)
+        self.reset()
+
+    @property
+    def records(self):
+        return self.items
+
+    def reset(self):
+        self.set_items([])
+        self._seen_ids = set()
+        self.page = 0
+        self.has_next_page = False
+
+    def add_page(self, page, records, has_next_page):
+        """Append a page of records. Focus stays on the row it was on."""
+        self.extend(records)
+        self.finish_page(page, has_next_page)
+
+    def extend(self, records):
+        """Append records of a page that is still arriving."""
+        for record in records:
+            mal_id = record.mal_id
+            if mal_id is not None:
+                if mal_id in self._seen_ids:
+                    continue
+                self._seen_ids.add(mal_id)
+            self.items.append(record)
+        self._modified()
+
+    def finish_page(self, page, has_next_page):
+        self.page = page
+        self.has_next_page = has_next_page
+
+
+class AnimeDetailView(urwid.WidgetWrap):
+    """
+    Scrollable detail pane for one anime, shown in place of the result list.
+    Starts out with what the search row knows and fills in synopsis, score,
+    episodes and genres once the full record is available.
+    ESC, backspace or left arrow go back to the results.
+    """
+    def __init__(self, controller, anime):
+        self.controller = controller
+        self.mal_id = anime.mal_id
+        self._anime = anime
+        self._walker = urwid.SimpleFocusListWalker([])
+        super().__init__(urwid.ListBox(self._walker))
+        self.set_details(None)
+
+    def set_details(self, details, error=None):
+        title = self._anime.title
+        title_english = self._anime.title_english
+        image_url = self._anime.image_url
+        if details is not None:
+            title = details.get("title") or title
+            title_english = details.get("title_english")
+            image_url = details.get("image_url") or image_url
+
+        lines = []
+        if self.controller.thumbnails and image_url:
+            lines += [self.controller.thumbnail_widget(image_url, THUMB_DETAIL_SIZE), urwid.Divider()]
+        lines.append(urwid.Text(("bold", title)))
+        if title_english and title_english != title:
+            lines.append(urwid.Text(("g42", title_english)))
+        lines.append(urwid.Divider())
+
+        if details is None:
+            lines.append(urwid.Text(("g42", f"Error: {error}" if error else "Loading details...")))
+        else:
+            facts = [
+                f"Score: {details['score'] if details.get('score') is not None else '?'}",
+                f"Episodes: {details['episodes'] if details.get('episodes') is not None else '?'}",
+            ]
+            kind = " ".join(str(part) for part in (details.get("type"), details.get("year")) if part)
+            if kind:
+                facts.append(kind)
+            if details.get("status"):
+                facts.append(details["status"])
+            lines.append(urwid.Text("  ".join(facts)))
+            if details.get("genres"):
+                lines.append(urwid.Text(("g42", ", ".join(details["genres"]))))
+            lines.append(urwid.Divider())
+            lines.append(urwid.Text(details.get("synopsis") or "No synopsis available."))
+        self._walker[:] = lines
+        self._walker.set_focus(0)
+
+    def keypress(self, size, key):
+        if key in ("esc", "backspace", "left"):
+            self.controller.close_details()
+            return None
+        return super().keypress(size, key)
+
+
+class FocusReportingListBox(VirtualListBox):
     """
-    A custom ListBox that retains default key and mouse behaviors for the menu.
+    A custom ListBox that retains default key and mouse behaviors for the menu
+    and tells the controller whenever they may have moved the focus.
     """
     def __init__(self, body, controller):
         super().__init__(body)
         self.controller = controller
 
     def keypress(self, size, key):
-        return super().keypress(size, key)
+        key = super().keypress(size, key)
+        self.controller.focus_changed()
+        return key
 
     def mouse_event(self, size, event, button, col, row, focus):
-        return super().mouse_event(size, event, button, col, row, focus)
+        handled = super().mouse_event(size, event, button, col, row, focus)
+        self.controller.focus_changed()
+        return handled
 
 
 class MenuController:
@@ -218,60 +1718,376 @@ class MenuController:
     Displays status messages in a separate message area in 'g42' color,
     centers them, rather than using the menu items as placeholders.
     """
-    def __init__(self):
+    def __init__(self, client, cache=None, index=None, live_search=False, debounce=0.3,
+                 thumbnails=False, thumb_cache=None):
+        self.client = client
+        self.cache = cache
+        self.index = index
+        self.thumbnails = thumbnails
+        self.thumb_cache = thumb_cache
+        self.image_runner = None
+        self._thumbs = {}
+        self._thumb_waiting = {}
+        self.live_search = live_search
+        self.debounce = debounce
+        self._live_alarm = None
         self.menu_list = None
         self.message_widget = urwid.Text(("g42", "Results appear here."), align="center")
         self.footer = urwid.Text(
-            ("instructions", " q/esc: Quit  ↑/↓: Navigate  n: Focus Search "),
+            ("instructions", " q/esc: Quit  ↑/↓: Navigate  n: Focus Search  c: Cache Stats "),
             align="center"
         )
         self.menu_content = None
         self.menu_pile = None
         self.loop = None
+        self.splash = None
+        self.splash_skipped = False
+        self.menu_widget = None
+        self.warming = 0  # background jobs to finish before the splash ends
+        self.runner = None
+        # Every search bumps the generation; responses tagged with an
+        # older generation are dropped so they can't overwrite newer ones.
+        self._search_generation = 0
+        self._search_future = None
+        self._page_future = None
+        self._streaming = None
+        self._query = ""
+        self.body_pile = None
+        self.result_area = None
+        self.detail_view = None
+        self._details = {}
+        self._detail_inflight = {}
+        self._detail_queue = []
 
-    def menu_handler(self, button, choice):
-        pass
+    def menu_handler(self, anime, button):
+        self.open_details(anime)
+
+    def open_details(self, anime):
+        """
+        Show the detail pane for `anime`. Usually a hit in the details
+        prefetched while the row had focus; otherwise loaded right away,
+        from the cache or the API.
+        """
+        mal_id = anime.mal_id
+        self.detail_view = AnimeDetailView(self, anime)
+        self.body_pile.contents[1] = (self.detail_view, self.body_pile.options())
+        self.body_pile.focus_position = 1
+        self.message_widget.set_text(("g42", "esc/←: Back to results"))
+        if mal_id is None:
+            self.detail_view.set_details(None, "no MyAnimeList id")
+            return
+
+        details = self._details.get(mal_id)
+        if details is not None:
+            self.detail_view.set_details(details)
+        else:
+            # The cache is read on the worker too, off the UI thread
+            self.fetch_details(mal_id, PRIORITY_INTERACTIVE)
+
+    def close_details(self):
+        self.detail_view = None
+        self.body_pile.contents[1] = (self.result_area, self.body_pile.options())
+        self.body_pile.focus_position = 1
+        self.message_widget.set_text("")
+
+    def prefetch_details(self):
+        """
+        Queue detail fetches for the focused row and its neighbours, nearest
+        first. Replaces the previous queue, so fast scrolling only ever
+        fetches around where the focus ends up.
+        """
+        walker = self.menu_list
+        if not walker:
+            return
+        positions = [walker.focus]
+        for distance in range(1, DETAIL_PREFETCH_RADIUS + 1):
+            positions += [walker.focus + distance, walker.focus - distance]
+        self._detail_queue = [
+            walker.records[position].mal_id
+            for position in positions
+            if 0 <= position < len(walker)
+        ]
+        self._pump_detail_prefetch()
+
+    def _pump_detail_prefetch(self):
+        while self._detail_queue and len(self._detail_inflight) < DETAIL_PREFETCH_WORKERS:
+            mal_id = self._detail_queue.pop(0)
+            if mal_id is None or mal_id in self._details or mal_id in self._detail_inflight:
+                continue
+            self.fetch_details(mal_id, PRIORITY_BACKGROUND, probe=True)
+
+    def fetch_details(self, mal_id, priority, probe=False, refresh=False):
+        if mal_id in self._detail_inflight:
+            return
+        self._detail_inflight[mal_id] = self.runner.submit(
+            load_anime_details,
+            lambda future: self.details_loaded(mal_id, future),
+            self.client, mal_id, self.cache, priority, probe, refresh,
+            priority=priority
+        )
+
+    def details_loaded(self, mal_id, future):
+        self._detail_inflight.pop(mal_id, None)
+        showing = self.detail_view is not None and self.detail_view.mal_id == mal_id
+        if not future.cancelled():
+            try:
+                self._details[mal_id], stale = future.result()
+            except Exception as e:
+                if showing and mal_id not in self._details:
+                    self.detail_view.set_details(None, e)
+            else:
+                if showing:
+                    self.detail_view.set_details(self._details[mal_id])
+                if stale:
+                    self.fetch_details(mal_id, PRIORITY_BACKGROUND, refresh=True)
+        self._pump_detail_prefetch()
 
     def exit_program(self, button=None):
         raise urwid.ExitMainLoop()
 
-    def perform_search(self, query):
+    def schedule_live_search(self, text):
+        """
+        Live-search mode: (re)start the debounce timer on every edit, so a
+        request only goes out once typing pauses for `debounce` seconds.
+        """
+        if self._live_alarm is not None:
+            self.loop.remove_alarm(self._live_alarm)
+        self._live_alarm = self.loop.set_alarm_in(
+            self.debounce, lambda loop, query: self.perform_search(query, live=True), text
+        )
+
+    def perform_search(self, query, live=False):
         """
-        Called when the user presses ENTER in the search box.
-        Displays 'Fetching...' in the message area,
-        fetches anime data from Jikan v4,
-        then updates the result list or shows an appropriate message.
+        Called when the user presses ENTER in the search box, or by the
+        debounce timer in live-search mode.
+        Displays 'Fetching...' in the message area and hands the lookup to
+        the background runner, so the UI keeps handling input while it is in
+        flight: a cached page comes straight back (a stale one is then
+        refreshed in the background), anything else is a Jikan v4 request. A live search instead
+        keeps the current rows up until the new ones arrive and replace them
+        in place. A newer search cancels (or, once started, discards) the
+        previous one.
         """
+        if self._live_alarm is not None:
+            self.loop.remove_alarm(self._live_alarm)
+            self._live_alarm = None
         query = query.strip()
+        if live and query == self._query:
+            return
+        self._search_generation += 1
+        if self.detail_view is not None:
+            self.close_details()
+        for future in (self._search_future, self._page_future):
+            if future is not None:
+                future.cancel()
+        self._search_future = None
+        self._page_future = None
+        self._query = query
+
         if not query:
+            self.menu_list.reset()
             self.message_widget.set_text(("g42", "Results appear here."))
-            self.menu_list.clear()
             return
 
-        self.message_widget.set_text(("g42", "Fetching..."))
-        self.menu_list.clear()
-        if self.loop:
-            self.loop.draw_screen()
+        # Titles seen before can be shown straight away from the local index;
+        # the cached or network page replaces them when it arrives.
+        local = self.index.search(query) if self.index is not None else []
+        if local or not live:
+            self.menu_list.reset()
+            self.menu_list.add_page(0, local, False)
+        if not live:
+            self.message_widget.set_text(("g42", "Fetching..."))
+
+        generation = self._search_generation
+        self._search_future = self.runner.submit(
+            load_anime_page,
+            lambda future: self.show_results(generation, 1, future),
+            self.client, query, 1, self.cache, PRIORITY_INTERACTIVE,
+            self.record_streamer(generation, 1)
+        )
+
+    def record_streamer(self, generation, page):
+        """Worker-side on_records callback that forwards batches to stream_records()."""
+        return lambda records: self.runner.call_soon(self.stream_records, generation, page, records)
+
+    def stream_records(self, generation, page, records):
+        """
+        Runs on the main loop for each batch of rows parsed from a page that
+        is still downloading, so the first rows show before the body ends.
+        """
+        if generation != self._search_generation:
+            return
+        if self._streaming != (generation, page):
+            self._streaming = (generation, page)
+            if page == 1:
+                self.message_widget.set_text("")
+                self.replace_results(records)
+                return
+        self.menu_list.extend(records)
+
+    def show_results(self, generation, page, future, refresh=False):
+        """
+        Runs on the main loop once a page fetch finishes.
+        Completes the streamed rows, or updates the result list or shows an
+        appropriate message. A failed background refresh leaves the cached
+        rows in place.
+        """
+        if generation != self._search_generation or future.cancelled():
+            return
+        if page == 1:
+            self._search_future = None
+        else:
+            self._page_future = None
+        streamed = self._streaming == (generation, page)
+        self._streaming = None
 
-        url = f"https://api.jikan.moe/v4/anime?q={query}"
         try:
-            resp = requests.get(url, timeout=10)
-            resp.raise_for_status()
-            data = resp.json().get("data", [])
+            result, stale = future.result()
         except Exception as e:
-            self.message_widget.set_text(("g42", f"Error: {e}"))
+            if page > 1:
+                self.message_widget.set_text(("g42", f"Error loading page {page}: {e}"))
+            elif not refresh:
+                if not streamed:
+                    self.menu_list.reset()
+                self.message_widget.set_text(("g42", f"Error: {e}"))
             return
 
-        if not data:
+        if streamed:
+            self.menu_list.finish_page(page, result["has_next_page"])
+        elif page == 1:
+            # Only swap in a refreshed first page if the user hasn't
+            # scrolled on into later pages in the meantime.
+            if refresh and self.menu_list.page != 1:
+                return
+            self.replace_results(result["data"])
+            self.menu_list.finish_page(1, result["has_next_page"])
+        else:
+            self.menu_list.add_page(page, result["data"], result["has_next_page"])
+        self.page_loaded(result)
+        if stale and page == 1:
+            # Stale-while-revalidate: keep showing the cached rows and
+            # swap in the fresh ones when the refresh comes back.
+            self._search_future = self.runner.submit(
+                load_anime_page,
+                lambda future: self.show_results(generation, 1, future, refresh=True),
+                self.client, self._query, 1, self.cache, PRIORITY_BACKGROUND, None, True,
+                priority=PRIORITY_BACKGROUND
+            )
+
+    def replace_results(self, records):
+        """
+        Replace the rows (local pre-results, or a stale cached page),
+        keeping focus on the same title if the new rows have it too.
+        """
+        walker = self.menu_list
+        focused = walker.records[walker.focus].mal_id if walker else None
+        walker.reset()
+        walker.extend(records)
+        for position, anime in enumerate(walker.records):
+            if focused is not None and anime.mal_id == focused:
+                walker.set_focus(position)
+                break
+
+    def page_loaded(self, result):
+        self.remember_titles(result["data"])
+        if self.menu_list:
+            self.message_widget.set_text("")
+        else:
             self.message_widget.set_text(("g42", "No results found."))
+        self.prefetch_next_page()
+        self.prefetch_details()
+
+    def load_title_index(self):
+        if self.index is not None:
+            self.warming += 1
+            self.runner.submit(self.index.load, self.title_index_loaded)
+
+    def title_index_loaded(self, future):
+        self.index.finish_load(future)
+        self.warming -= 1
+        self.end_splash()
+
+    def remember_titles(self, records):
+        if self.index is None:
             return
+        rows = self.index.add(records)
+        if rows:
+            self.runner.submit(self.index.save, lambda future: None, rows, priority=PRIORITY_BACKGROUND)
 
-        self.message_widget.set_text("")
-        for anime in data:
-            title = anime.get("title", "Unknown Title")
-            button = MenuButton(title)
-            urwid.connect_signal(button, "click", self.menu_handler, user_args=[button])
-            self.menu_list.append(button)
+    def focus_changed(self):
+        self.prefetch_next_page()
+        self.prefetch_details()
+
+    def prefetch_next_page(self):
+        """
+        Fetch the next page in the background once focus is within
+        PREFETCH_MARGIN rows of the end, so scrolling never waits on it.
+        """
+        walker = self.menu_list
+        if not walker.has_next_page or self._page_future is not None or self._search_future is not None:
+            return
+        if walker.focus < len(walker) - PREFETCH_MARGIN:
+            return
+
+        page = walker.page + 1
+        generation = self._search_generation
+        self._page_future = self.runner.submit(
+            load_anime_page,
+            lambda future: self.show_results(generation, page, future),
+            self.client, self._query, page, self.cache, PRIORITY_BACKGROUND,
+            self.record_streamer(generation, page),
+            priority=PRIORITY_BACKGROUND
+        )
+
+    def thumbnail_widget(self, url, size):
+        """
+        A Text of `size` cells that shows the poster at `url`. Blank until
+        the image runner has decoded it; instant for posters seen before.
+        """
+        cols, rows = size
+        text = urwid.Text("\n".join([" " * cols] * rows), wrap="clip")
+        key = (url, size)
+        markup = self._thumbs.get(key)
+        if markup is not None:
+            text.set_text(markup)
+            return text
+        waiting = self._thumb_waiting.get(key)
+        if waiting is not None:
+            waiting.append(text)
+            return text
+        self._thumb_waiting[key] = [text]
+        self.image_runner.submit(
+            fetch_thumbnail,
+            lambda future: self.thumbnail_loaded(key, future),
+            self.client, url, size, self.thumb_cache
+        )
+        return text
+
+    def thumbnail_loaded(self, key, future):
+        waiting = self._thumb_waiting.pop(key, [])
+        if future.cancelled() or future.exception() is not None:
+            return
+        markup = self._thumbs[key] = thumbnail_markup(future.result())
+        for text in waiting:
+            text.set_text(markup)
+
+    def make_row(self):
+        button = MenuButton("")
+        urwid.connect_signal(button, "click", lambda button: self.menu_handler(button.item, button))
+        if not self.thumbnails:
+            return button
+        thumbnail = urwid.Text("")
+        return urwid.Columns([("fixed", THUMB_ROW_SIZE[0], thumbnail), button], dividechars=1)
+
+    def bind_row(self, row, anime):
+        if self.thumbnails:
+            if anime.image_url is None:
+                thumbnail = urwid.Text("\n".join([""] * THUMB_ROW_SIZE[1]))
+            else:
+                thumbnail = self.thumbnail_widget(anime.image_url, THUMB_ROW_SIZE)
+            row.contents[0] = (thumbnail, row.options("given", THUMB_ROW_SIZE[0]))
+            row = row.contents[1][0]
+        row.bind(anime.title, anime)
 
     def create_menu(self):
         search_edit = CursorAwareEdit(controller=self, caption=" ⌕ ", allow_tab=False)
@@ -285,7 +2101,11 @@ class MenuController:
             blcorner="└", bline="─", brcorner="┘"
         )
 
-        self.menu_list = urwid.SimpleFocusListWalker([])
+        self.menu_list = PagedResultWalker(
+            self.make_row,
+            self.bind_row,
+            row_height=THUMB_ROW_SIZE[1] if self.thumbnails else 1
+        )
         listbox_widget = FocusReportingListBox(self.menu_list, self)
         scrollbar = urwid.ScrollBar(listbox_widget)
         scrollframe = urwid.AttrMap(scrollbar, "scrollbar")
@@ -293,17 +2113,17 @@ class MenuController:
         self.message_widget.set_text(("g42", "Results appear here."))
         message_map = urwid.AttrMap(self.message_widget, "menu-normal")
 
-        main_list_area = urwid.Columns([
+        self.result_area = urwid.Columns([
             ("weight", 1, listbox_widget),
             ("fixed", 1, scrollframe),
         ], dividechars=0)
 
-        body_pile = urwid.Pile([
+        self.body_pile = urwid.Pile([
             ("pack", message_map),
-            main_list_area
+            self.result_area
         ])
 
-        self.menu_content = NonTabSearchPile([body_pile])
+        self.menu_content = NonTabSearchPile([self.body_pile])
 
         menu_box = urwid.LineBox(
             self.menu_content,
@@ -327,19 +2147,27 @@ class MenuController:
             self.menu_pile.focus_position = 0
 
     def handle_key(self, key):
-        if key in ("q", "Q", "esc"):
+        if self.splash is not None:
+            self.end_splash(skip=True)
+        elif key in ("q", "Q", "esc"):
             self.exit_program()
         elif key in ("n", "N"):
             self.focus_search_box()
+        elif key in ("c", "C") and self.cache is not None:
+            self.footer.set_text(("instructions", f" {self.cache.stats()} "))
+        elif key in ("b", "B") and isinstance(self.loop.screen, LowBandwidthScreen):
+            self.footer.set_text(("instructions", f" {self.loop.screen.stats()} "))
 
     def show_splash_screen(self, loop, user_data):
         self.loop = loop
-        ascii_art = pyfiglet.figlet_format("AnimePaheDL", font="slant")
+        cols, _ = loop.screen.get_cols_rows()
+        ascii_art = splash_art("AnimePaheDL", "slant", cols)
         splash_text = urwid.Text(ascii_art, align="center")
         splash = urwid.AttrMap(splash_text, "splash-col")
-        filler = urwid.Filler(splash, valign="middle")
-        loop.widget = filler
-        loop.set_alarm_in(2, self.show_menu)
+        self.splash = urwid.Filler(splash, valign="middle")
+        loop.widget = self.splash
+        # Build the menu as soon as the splash is up; end_splash() swaps it in
+        loop.set_alarm_in(0, self.show_menu)
 
     def show_menu(self, loop, user_data):
         menu = self.create_menu()
@@ -350,7 +2178,7 @@ class MenuController:
 
         main = urwid.Padding(main, left=1, right=1)
 
-        top = urwid.Overlay(
+        self.menu_widget = urwid.Overlay(
             main,
             urwid.SolidFill(" "),
             align="center",
@@ -358,11 +2186,79 @@ class MenuController:
             valign="middle",
             height=("relative", 50)
         )
-        loop.widget = top
+        self.end_splash()
+
+    def end_splash(self, skip=False):
+        """
+        Replace the splash with the menu once the menu is built and the
+        warm-up work is done. A keypress (skip=True) does not wait for
+        the warm-up.
+        """
+        if self.splash is None:
+            return
+        self.splash_skipped = self.splash_skipped or skip
+        if self.menu_widget is None or (self.warming and not self.splash_skipped):
+            return
+        self.splash = None
+        self.loop.widget = self.menu_widget
+        startup_profile.mark("menu ready")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Search anime on MyAnimeList through the Jikan API.")
+    parser.add_argument("--cache-ttl", type=float, default=3600,
+                        help="seconds before a cached search is refreshed in the background (default: 3600)")
+    parser.add_argument("--cache-size", type=int, default=1000,
+                        help="maximum number of cached responses kept on disk (default: 1000)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always query the API; no on-disk cache or local title index")
+    parser.add_argument("--api-url", default=JIKAN_API_URL,
+                        help=f"Jikan API root, e.g. a local stand-in server (default: {JIKAN_API_URL})")
+    parser.add_argument("--thumbnails", action="store_true",
+                        help="show poster thumbnails in the results and detail pane (needs Pillow)")
+    parser.add_argument("--live", action="store_true",
+                        help="search as you type instead of on ENTER")
+    parser.add_argument("--debounce", type=int, default=300, metavar="MS",
+                        help="live search: pause in typing before a search is sent (default: 300)")
+    parser.add_argument("--low-bandwidth", action="store_true",
+                        help="repaint only the changed parts of each row, for slow SSH links; "
+                             "press b to show bytes written per frame")
+    parser.add_argument("--colors", type=int, choices=(16, 256), default=256,
+                        help="terminal colours to use; 16 sends shorter escape sequences (default: 256)")
+    parser.add_argument("--fps", type=int, default=60,
+                        help="most frames drawn per second (default: 60)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print import, first-frame and menu-ready timings to stderr on exit")
+    return parser.parse_args(argv)
 
 
 def main():
-    controller = MenuController()
+    args = parse_args()
+    if args.thumbnails:
+        # Only check it is there; decoding imports it when first needed
+        if importlib.util.find_spec("PIL") is None:
+            sys.exit("--thumbnails needs Pillow: pip install pillow")
+    cache = None
+    index = None
+    thumb_cache = None
+    if not args.no_cache:
+        cache = ResponseCache(ttl=args.cache_ttl, max_entries=args.cache_size)
+        index = TitleIndex()
+        if args.thumbnails:
+            thumb_cache = ResponseCache(
+                os.path.join(user_cache_dir(), "thumbnails.sqlite3"),
+                ttl=float("inf"),
+                max_entries=5000
+            )
+    controller = MenuController(
+        JikanClient(args.api_url),
+        cache=cache,
+        index=index,
+        live_search=args.live,
+        debounce=args.debounce / 1000,
+        thumbnails=args.thumbnails,
+        thumb_cache=thumb_cache
+    )
     palette = [
         ("title-col", "dark red", ""),
         ("center", "default", ""),
@@ -376,16 +2272,29 @@ def main():
     ]
 
     # With handle_mouse=True, the user can click on the search box to focus it
-    loop = urwid.MainLoop(
+    loop = ScheduledMainLoop(
         urwid.SolidFill(" "),
         palette=palette,
         unhandled_input=controller.handle_key,
-        handle_mouse=True
+        handle_mouse=True,
+        screen=LowBandwidthScreen(low_bandwidth=args.low_bandwidth),
+        fps=args.fps
     )
     controller.loop = loop
+    controller.runner = BackgroundRunner(loop)
+    # Image decoding gets its own workers so it never delays API requests.
+    controller.image_runner = BackgroundRunner(loop, workers=2)
+    controller.load_title_index()
+    CursorController().attach(loop.screen)
+    if args.profile_startup:
+        startup_profile.attach(loop.screen)
     loop.set_alarm_in(0, controller.show_splash_screen)
-    loop.screen.set_terminal_properties(colors=256)
-    loop.run()
+    loop.screen.set_terminal_properties(colors=args.colors)
+    try:
+        loop.run()
+    finally:
+        if args.profile_startup:
+            print(startup_profile.report(), file=sys.stderr)
 
 
 if __name__ == "__main__":
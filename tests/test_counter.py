@@ -0,0 +1,40 @@
+import os
+import sys
+import socket
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import counter  # noqa: E402
+
+
+@pytest.mark.parametrize("maxcol", [1, 5, 20, counter.CounterGrid.CELL - 1, counter.CounterGrid.CELL + 5])
+def test_grid_fits_narrow_widths(maxcol):
+    names = ["requests", "a-much-longer-counter-name", "errors"]
+    values = {"requests": 123456789, "a-much-longer-counter-name": -5, "errors": 0}
+    grid = counter.CounterGrid(names, values)
+    grid.current = 2
+    canvas = grid.render((maxcol, 4), focus=True)
+    assert canvas.cols() == maxcol
+    assert canvas.rows() == 4
+    for line in canvas.text:
+        assert len(line) == maxcol
+
+
+def test_listen_keeps_a_file_that_is_not_a_socket(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("keep me")
+    with pytest.raises(FileExistsError):
+        counter.EventIngest().start(f"unix:{path}")
+    assert path.read_text() == "keep me"
+
+
+def test_listen_replaces_a_stale_socket(tmp_path):
+    path = str(tmp_path / "events.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    ingest = counter.EventIngest()
+    ingest.start(f"unix:{path}")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)